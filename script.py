@@ -1,24 +1,172 @@
 import time
 import os
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import InvalidSessionIdException, TimeoutException, WebDriverException, StaleElementReferenceException
-from multiprocessing import Process, Pool
+import sys
+import argparse
+import json
+import hashlib
+import gzip
+import sqlite3
+import subprocess
+import tempfile
+import socket
+import uuid
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+import math
+import threading
+import queue
+from functools import partial
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urldefrag, urlsplit
+import re
+from multiprocessing import Event, Process, Queue, Value
+# pandas, requests, lxml and Selenium are imported where they are used, so every process only loads what it needs
+
+# When the script started, for the time-to-first-page figure of the run report
+SCRIPT_STARTED = time.time()
+
+# Root of the Oracle HCM tables and views reference for a given release
+DOCS_URL_TEMPLATE = "https://docs.oracle.com/en/cloud/saas/human-resources/{release}/oedmh/"
+DEFAULT_RELEASE = "25a"
+
+# Function to get the documentation root of a release
+def release_base_url(release):
+    return DOCS_URL_TEMPLATE.format(release=release)
+
+BASE_URL = release_base_url(DEFAULT_RELEASE)
+
+# Normalised datasets of the consolidated SQLite/Parquet output and the columns after release, section, kind, page
+DATASETS = {
+    "tables": ["header", "paragraph", "details", "columns_headers", "indexes_headers", "foreign_keys_headers"],
+    "views": ["header", "details", "columns_headers", "query_headers"],
+    "columns": ["position", "name", "cells"],
+    "primary_keys": ["position", "name", "columns"],
+    "indexes": ["position", "name", "cells"],
+    "foreign_keys": ["position", "table_name", "foreign_table", "foreign_key_column", "cells"],
+    "view_queries": ["position", "query", "cells"],
+}
+STORE_DATASETS = {
+    dataset: ["release", "section", "kind", "page"] + columns
+    for dataset, columns in {**DATASETS, "pages": ["content_hash", "written_at"]}.items()
+}
+
+# Version of the TOC manifest layout; bump it when the layout changes so older manifests get rebuilt
+MANIFEST_VERSION = 1
+
+# Default number of concurrent fetches for the HTTP engine
+HTTP_WORKERS = 16
 
 # Function to read expected names from a file
 def read_expected_names(file_path):
     with open(file_path, 'r') as file:
         return [line.strip() for line in file if line.strip()]
 
+# Script run inside the page to extract every section in a single WebDriver round trip.
+# It applies the same XPaths and row rules as the per-cell extractors below.
+EXTRACT_PAGE_SCRIPT = """
+var kind = arguments[0];
+function first(xpath, context) {
+    return document.evaluate(xpath, context || document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function all(xpath, context) {
+    var result = document.evaluate(xpath, context || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < result.snapshotLength; i++) {
+        nodes.push(result.snapshotItem(i));
+    }
+    return nodes;
+}
+function text(node) {
+    return (node.innerText || '').replace(/\\u00a0/g, ' ').trim();
+}
+function section(sectionId) {
+    return first("//section[@class='section'][h2[@id='" + sectionId + "']]");
+}
+function sectionTable(sectionId, summary, matchHeaders) {
+    var container = section(sectionId);
+    var table = container && first(".//table[@summary='" + summary + "']", container);
+    if (!table) {
+        return [[], []];
+    }
+    var headers = all(".//thead/tr/th", table).map(text);
+    var rows = all(".//tbody/tr", table).map(function (row) { return all(".//td", row).map(text); });
+    if (matchHeaders) {
+        rows = rows.filter(function (row) { return row.length === headers.length; });
+    }
+    return [rows, headers];
+}
+var header = first("//header/h1[@class='fa-chapter topic_link']");
+if (!header) {
+    throw new Error("Header not found");
+}
+var data = {header: text(header)};
+var details = section('Details');
+data.details = details ? all(".//li/p[@class='p']", details).map(text) : [];
+var result;
+if (kind === 'table') {
+    var paragraph = first("//p[@class='p']");
+    if (!paragraph) {
+        throw new Error("Paragraph not found");
+    }
+    data.paragraph = text(paragraph);
+    var primaryKey = section('Primary-Key');
+    var primaryKeyTable = primaryKey && first(".//table[@summary='Primary Key']", primaryKey);
+    data.primary_key = !primaryKeyTable ? [] : all(".//tr[@class='row']", primaryKeyTable)
+        .map(function (row) { return all(".//td[@class='entry']", row).map(text); })
+        .filter(function (row) { return row.length === 2; });
+    result = sectionTable('Columns', 'Columns', false);
+    data.columns = result[0];
+    data.columns_headers = result[1];
+    result = sectionTable('Indexes', 'Indexes', false);
+    data.indexes = result[0];
+    data.indexes_headers = result[1];
+    result = sectionTable('Foreign-Keys', 'Foreign Keys', false);
+    data.foreign_keys = result[0];
+    data.foreign_keys_headers = result[1];
+} else {
+    result = sectionTable('Columns', 'Columns', true);
+    data.columns = result[0];
+    data.columns_headers = result[1];
+    result = sectionTable('Query', 'Query', true);
+    data.query = result[0];
+    data.query_headers = result[1];
+}
+return data;
+"""
+
+# Function to extract a whole page with one injected script instead of one WebDriver call per cell
+def extract_page_with_script(driver, kind):
+    return driver.execute_script(EXTRACT_PAGE_SCRIPT, kind)
+
 # Function to extract data from the target page
 def extract_data(driver, section_name, page_name):
+    print(f"Extracting data for table: {page_name} in section: {section_name}")
+    return extract_page_with_script(driver, "table")
+
+# Function to extract data from the views page
+def extract_view_data(driver, section_name, page_name):
+    print(f"Extracting data for view: {page_name} in section: {section_name}")
+    return extract_page_with_script(driver, "view")
+
+# Function to time the single-script extraction against the per-cell one on the current page
+def compare_extraction(driver, section_name, page_name, kind="table"):
+    per_cell_function = extract_data_per_cell if kind == "table" else extract_view_data_per_cell
+    start = time.perf_counter()
+    per_cell_data = per_cell_function(driver, section_name, page_name)
+    per_cell_time = time.perf_counter() - start
+    start = time.perf_counter()
+    data = extract_page_with_script(driver, kind)
+    script_time = time.perf_counter() - start
+    print(f"Extraction timing for {page_name} in section {section_name}: per-cell {per_cell_time:.3f}s, "
+          f"single script {script_time:.3f}s ({per_cell_time / max(script_time, 1e-6):.1f}x faster), "
+          f"outputs {'match' if data == per_cell_data else 'DIFFER'}")
+    return data
+
+# Function to extract data from the target page, one WebDriver call per element
+def extract_data_per_cell(driver, section_name, page_name):
+    from selenium.webdriver.common.by import By
+
     print(f"Extracting data for table: {page_name} in section: {section_name}")
     data = {}
 
@@ -92,8 +240,10 @@ def extract_data(driver, section_name, page_name):
 
     return data
 
-# Function to extract data from the views page
-def extract_view_data(driver, section_name, page_name):
+# Function to extract data from the views page, one WebDriver call per element
+def extract_view_data_per_cell(driver, section_name, page_name):
+    from selenium.webdriver.common.by import By
+
     print(f"Extracting data for view: {page_name} in section: {section_name}")
     data = {}
 
@@ -145,108 +295,206 @@ def extract_view_data(driver, section_name, page_name):
 
     return data
 
-# Helper function to save a DataFrame to an Excel sheet
-def save_dataframe_to_excel(writer, data, sheet_name, headers=None):
+# Function to read the visible text of an lxml element the way WebDriver's .text does
+def element_text(element):
+    if element.tag == "pre" or element.find(".//pre") is not None:
+        return element.text_content().strip()
+    pieces = ["\n" if not isinstance(piece, str) else piece for piece in element.xpath(".//text() | .//br")]
+    lines = (" ".join(line.split()) for line in "".join(pieces).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+# Helper function to find the first match of an XPath, raising if the page does not have it
+def find_required(tree, xpath):
+    found = tree.xpath(xpath)
+    if not found:
+        raise ValueError(f"Element not found: {xpath}")
+    return found[0]
+
+# Helper function to read the Details bullets of a parsed page
+def parse_details(tree):
+    details_section = tree.xpath("//section[@class='section'][h2[@id='Details']]")
+    if not details_section:
+        return []
+    return [element_text(detail) for detail in details_section[0].xpath(".//li/p[@class='p']")]
+
+# Helper function to read a headed table (thead/tbody) from a section of a parsed page
+def parse_section_table(tree, section_id, summary, match_headers=False):
+    section = tree.xpath(f"//section[@class='section'][h2[@id='{section_id}']]")
+    if not section:
+        return [], []
+    table = section[0].xpath(f".//table[@summary='{summary}']")
+    if not table:
+        return [], []
+    headers = [element_text(header) for header in table[0].xpath(".//thead/tr/th")]
+    rows = [[element_text(cell) for cell in row.xpath(".//td")] for row in table[0].xpath(".//tbody/tr")]
+    if match_headers:
+        rows = [row for row in rows if len(row) == len(headers)]  # Ensure row matches header length
+    return rows, headers
+
+# Function to parse a table page fetched over HTTP, mirroring extract_data
+def parse_table_page(content):
+    from lxml import html as lxml_html
+
+    tree = lxml_html.fromstring(content)
+    data = {}
+    data['header'] = element_text(find_required(tree, "//header/h1[@class='fa-chapter topic_link']"))
+    data['paragraph'] = element_text(find_required(tree, "//p[@class='p']"))
+    data['details'] = parse_details(tree)
+
+    primary_key_data = []
+    primary_key_section = tree.xpath("//section[@class='section'][h2[@id='Primary-Key']]")
+    if primary_key_section:
+        for table in primary_key_section[0].xpath(".//table[@summary='Primary Key']")[:1]:
+            for row in table.xpath(".//tr[@class='row']"):
+                row_data = [element_text(cell) for cell in row.xpath(".//td[@class='entry']")]
+                if len(row_data) == 2:  # Ensure row matches the expected number of columns
+                    primary_key_data.append(row_data)
+    data['primary_key'] = primary_key_data
+
+    data['columns'], data['columns_headers'] = parse_section_table(tree, 'Columns', 'Columns')
+    data['indexes'], data['indexes_headers'] = parse_section_table(tree, 'Indexes', 'Indexes')
+    data['foreign_keys'], data['foreign_keys_headers'] = parse_section_table(tree, 'Foreign-Keys', 'Foreign Keys')
+    return data
+
+# Function to parse a view page fetched over HTTP, mirroring extract_view_data
+def parse_view_page(content):
+    from lxml import html as lxml_html
+
+    tree = lxml_html.fromstring(content)
+    data = {}
+    data['header'] = element_text(find_required(tree, "//header/h1[@class='fa-chapter topic_link']"))
+    data['details'] = parse_details(tree)
+    data['columns'], data['columns_headers'] = parse_section_table(tree, 'Columns', 'Columns', match_headers=True)
+    data['query'], data['query_headers'] = parse_section_table(tree, 'Query', 'Query', match_headers=True)
+    return data
+
+# Parsers of the HTTP engine for each kind of page
+PAGE_PARSERS = {"tables": parse_table_page, "views": parse_view_page}
+
+# Helper function to build the DataFrame of an Excel sheet, or None if there is no usable data
+def build_dataframe(data, headers=None):
+    import pandas as pd
+
     if data:
         try:
             if headers and len(headers) > 1:
                 if not all(isinstance(row, list) and len(row) == len(headers) for row in data):
                     raise ValueError(f"Data shape mismatch: Expected {len(headers)} columns, but got inconsistent row lengths.")
-            df = pd.DataFrame(data, columns=headers) if headers else pd.DataFrame(data)
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
+            return pd.DataFrame(data, columns=headers) if headers else pd.DataFrame(data)
         except Exception:
             pass
+    return None
 
 # Refactored save_to_excel function
-def save_to_excel(data, file_path):
-    with pd.ExcelWriter(file_path) as writer:
-        save_dataframe_to_excel(writer, [{'Header': data['header']}], 'Header')
-        save_dataframe_to_excel(writer, data['details'], 'Details', ['Details'])
-        save_dataframe_to_excel(writer, data.get('primary_key'), 'Primary Key', ['Name', 'Columns'])
-        save_dataframe_to_excel(writer, data.get('columns'), 'Columns', data.get('columns_headers'))
-        save_dataframe_to_excel(writer, data.get('indexes'), 'Indexes', data.get('indexes_headers'))
-        save_dataframe_to_excel(writer, data.get('foreign_keys'), 'Foreign Keys', data.get('foreign_keys_headers'))
-        save_dataframe_to_excel(writer, data.get('query'), 'Query', data.get('query_headers'))
-
-# Function to expand a dropdown with retries and fallback mechanism
-def expand_dropdown_with_retries(driver, dropdown_id, dropdown_type, section_name, retries=10):
-    dropdown = None  # Initialize dropdown to avoid unbound local variable error
-    for attempt in range(retries):
-        try:
-            print(f"Attempting to click {dropdown_type} dropdown for section: {section_name} (Attempt {attempt + 1}/{retries})")
-            
-            # Scroll to the dropdown area to ensure it is visible
-            dropdown_area = WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.XPATH, f"//li[@id='{dropdown_id}']"))
-            )
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", dropdown_area)
-            print(f"Scrolled to {dropdown_type} dropdown area for section: {section_name}")
+def save_to_excel(data, file_path, timer=None):
+    with timed(timer, "serialize"):
+        sheets = [
+            ('Header', build_dataframe([{'Header': data['header']}])),
+            ('Details', build_dataframe(data['details'], ['Details'])),
+            ('Primary Key', build_dataframe(data.get('primary_key'), ['Name', 'Columns'])),
+            ('Columns', build_dataframe(data.get('columns'), data.get('columns_headers'))),
+            ('Indexes', build_dataframe(data.get('indexes'), data.get('indexes_headers'))),
+            ('Foreign Keys', build_dataframe(data.get('foreign_keys'), data.get('foreign_keys_headers'))),
+            ('Query', build_dataframe(data.get('query'), data.get('query_headers'))),
+        ]
+    with timed(timer, "write"):
+        import pandas as pd
 
-            # Locate and click the dropdown
-            dropdown = WebDriverWait(driver, 30).until(
-                EC.element_to_be_clickable((By.XPATH, f"//li[@id='{dropdown_id}'][contains(@class, 'oj-collapsed')]"))
-            )
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", dropdown)
-            ActionChains(driver).move_to_element(dropdown).click().perform()
-            print(f"Successfully clicked {dropdown_type} dropdown for section: {section_name}")
+        with pd.ExcelWriter(file_path) as writer:
+            for sheet_name, df in sheets:
+                if df is not None:
+                    try:
+                        df.to_excel(writer, sheet_name=sheet_name, index=False)
+                    except Exception:
+                        pass
 
-            # Wait for and click the first page in the dropdown
-            first_page = WebDriverWait(driver, 30).until(
-                EC.element_to_be_clickable((By.XPATH, f"//li[@id='{dropdown_id}']//li[@class='oj-typography-body-xs tree-view-row oj-treeview-item oj-treeview-leaf'][1]//span[@class='oj-treeview-item-text tree-view-item']"))
-            )
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", first_page)
-            ActionChains(driver).move_to_element(first_page).click().perform()
-            print(f"Successfully clicked the first page in {dropdown_type} dropdown for section: {section_name}")
-            return
-        except Exception as e:
-            print(f"Error clicking {dropdown_type} dropdown or first page for section: {section_name}: {e}")
-            # Retry after a delay
-            time.sleep(5)
-    print(f"Failed to click {dropdown_type} dropdown or first page for section: {section_name} after {retries} retries")
-    raise Exception(f"Failed to click {dropdown_type} dropdown or first page for section: {section_name}")
-
-# Function to refresh the WebDriver session if it becomes unresponsive
-def refresh_driver_session():
-    global driver
+# Function to replace a browser with a fresh session, e.g. after it crashed or grew too large
+def refresh_driver_session(driver, options):
     print("Refreshing WebDriver session...")
-    driver.quit()
-    driver = start_webdriver_session()
-
-# Function to extract all pages in a dropdown sequentially
-def extract_all_pages(driver, dropdown_id, section_name, save_dir, extract_function):
-    try:
-        page_elements = WebDriverWait(driver, 30).until(
-            EC.presence_of_all_elements_located((By.XPATH, f"//li[@id='{dropdown_id}']//li[@class='oj-typography-body-xs tree-view-row oj-treeview-item oj-treeview-leaf']"))
-        )
-        page_names = [
-            page.find_element(By.XPATH, ".//span[@class='oj-treeview-item-text tree-view-item']").text.strip()
-            for page in page_elements
-        ]
+    try:
+        driver.quit()
+    except Exception:
+        pass  # The old browser may already be gone
+    return start_browser_session(options)
 
-        for page_name in page_names:
-            retries = 3  # Retry up to 3 times for transient errors
-            for attempt in range(retries):
-                try:
-                    print(f"Processing page: {page_name} in section: {section_name} (Attempt {attempt + 1}/{retries})")
-                    # Re-locate the page element to avoid stale element issues
-                    page_element = WebDriverWait(driver, 30).until(
-                        EC.presence_of_element_located((By.XPATH, f"//span[text()='{page_name}']"))
-                    )
-                    ActionChains(driver).move_to_element(page_element).click().perform()
-                    time.sleep(2)
-                    data = extract_function(driver, section_name, page_name)
-                    save_path = os.path.join(save_dir, f'{page_name.lower()}.xlsx')
-                    save_to_excel(data, save_path)
-                    break  # Exit the retry loop if successful
-                except StaleElementReferenceException:
-                    print(f"Stale element encountered for page {page_name}. Retrying...")
-                    time.sleep(2)  # Wait before retrying
-                except Exception as e:
-                    print(f"Error processing page {page_name} in section {section_name}: {e}")
-                    if attempt == retries - 1:
-                        raise  # Raise the exception if all retries fail
-    except Exception as e:
-        print(f"Error extracting pages for section: {section_name}: {e}")
+# Function to start the browser of a worker, resolving chromedriver again once when Chrome refuses the session,
+# since a cached driver goes stale when Chrome updates itself; other errors, such as a slow index page, are raised
+def start_browser_session(options):
+    from selenium.common.exceptions import SessionNotCreatedException
+
+    if options.get("driver_cache"):
+        options["driver_path"] = resolve_chromedriver(options["driver_cache"])  # Another worker may have renewed it
+    try:
+        return start_webdriver_session(options["base_url"], options["profile"], options["driver_path"])
+    except SessionNotCreatedException as e:
+        print(f"Could not start a browser ({e.msg}); resolving chromedriver again")
+    options["driver_path"] = resolve_chromedriver(options.get("driver_cache"), refresh=True)
+    return start_webdriver_session(options["base_url"], options["profile"], options["driver_path"])
+
+# Function to check whether a browser session still answers
+def browser_is_alive(driver):
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+# Function to extract and save a single page, navigating straight to its URL; quiet leaves out the progress lines
+def extract_page(driver, task, extract_function, output, full=False, timer=None, quiet=False):
+    from selenium.common.exceptions import InvalidSessionIdException, StaleElementReferenceException, TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    page_name, section_name = task["name"], task["section"]
+    checkpoint = None if full else output.checkpoints.get(output.release, task)
+    current = checkpoint_is_current(checkpoint, task, output)
+    unchanged, validators = False, {}  # A page without a current checkpoint has nothing to revalidate
+    if current:
+        with timed(timer, "revalidate"):
+            unchanged, validators = check_page_unchanged(task, checkpoint)
+    if unchanged:
+        if not quiet:
+            print(f"Skipping unchanged page: {page_name} in section: {section_name}")
+        count_event(timer, "not_modified")
+        return "unchanged"
+
+    retries = 3  # Retry up to 3 times for transient errors
+    for attempt in range(retries):
+        try:
+            if not quiet:
+                print(f"Processing page: {page_name} in section: {section_name} (Attempt {attempt + 1}/{retries})")
+            if attempt:
+                count_event(timer, "page_retries")
+            with timed(timer, "navigate"):
+                throttle(task["url"])
+                driver.get(task["url"])
+            with timed(timer, "wait"):
+                WebDriverWait(driver, 30).until(
+                    EC.presence_of_element_located((By.XPATH, "//header/h1[@class='fa-chapter topic_link']"))
+                )
+            with timed(timer, "extract"):
+                data = extract_function(driver, section_name, page_name)
+            return save_page(task, data, output, checkpoint if current else None, validators, timer)
+        except StaleElementReferenceException:
+            print(f"Stale element encountered for page {page_name}. Retrying...")
+            count_event(timer, "stale_elements")
+            time.sleep(2)  # Wait before retrying
+        except TimeoutException as e:
+            print(f"Timed out waiting for page {page_name} in section {section_name}: {e}")
+            count_event(timer, "wait_timeouts")
+        except Exception as e:
+            if isinstance(e, InvalidSessionIdException) or not browser_is_alive(driver):
+                raise  # Retrying in a dead browser is pointless; the worker replaces it and requeues the page
+            print(f"Error processing page {page_name} in section {section_name}: {e}")
+            count_event(timer, "page_errors")
+    print(f"Giving up on page {page_name} in section {section_name} after {retries} attempts")
+    output.checkpoints.mark_failed(output.release, task, f"Failed after {retries} attempts")
+    return "failed"
+
+# Function to extract all pages of a tables or views group sequentially
+def extract_all_pages(driver, tasks, extract_function, output, full=False, timer=None):
+    return Counter(extract_page(driver, task, extract_function, output, full, timer) for task in tasks)
 
 # Helper function to create directories dynamically
 def create_save_directories(base_path, section_name, create_tables=True, create_views=True):
@@ -274,50 +522,53 @@ def get_save_path():
     user_input = input("Enter the path (or press Enter to use the recommended path): ").strip()
     return user_input if user_input else default_path
 
-# Define sections with their table and view requirements
-sections = [
-    ("2-AI", True, True),
-    ("3-Absence-Management", True, True),
-    ("4-Benefits", True, True),
-    ("5-Career-Development", True, True),
-    ("6-Celebrate", True, True),
-    ("7-Compensation", True, True),
-    ("8-Corporate-Social-Responsibility", True, True),
-    ("9-Fast-Formula", True, True),
-    ("10-Global-Human-Resources", True, True),
-    ("11-Global-Payroll", True, True),
-    ("12-Global-Payroll-Interface", True, True),
-    ("13-Goal-Management", True, True),
-    ("14-HCM-Common", True, True),
-    ("15-HCM-Communicate", False, True),
-    ("16-HCM-Configuration-Workbench", True, False),
-    ("17-HCM-Country-and-Vertical-Extensions", False, True),
-    ("18-HCM-Extracts", True, False),
-    ("19-Performance-Management", True, True),
-    ("20-Profile-Management", True, True),
-    ("21-Questionnaire", True, True),
-    ("22-Recruiting", True, True),
-    ("23-Social-Connection", True, False),
-    ("24-Succession-Management", True, True),
-    ("25-Talent-Review", True, True),
-    ("26-Time-and-Labor", True, True),
-    ("27-Touchpoints", True, True),
-    ("28-Work-Life", True, True),
-    ("29-Workforce-Directory-Management", True, True),
-    ("30-Workforce-Health-and-Safety-Incidents", True, True),
-    ("31-Workforce-Management", True, True),
-    ("32-Workforce-Modeling", True, True),
-    ("33-Workforce-Predictions", True, True),
-    ("34-Workforce-Reputation-Management", True, True),
-    ("35-Workforce-Scheduling", True, True),
+# Resources the lean browser profile never downloads: images, fonts, media and third-party hosts
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm",  # Stylesheets still load, since innerText depends on the layout they give
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*trustarc.com*", "*truste.com*",
+    "*omtrdc.net*", "*demdex.net*", "*everesttech.net*", "*bizible.com*", "*eloqua.com*", "*adobedtm.com*",
 ]
 
+# Cookies recording that the consent banner was answered, so the lean profile never has to click it
+LEAN_CONSENT_COOKIES = [
+    {"name": "notice_preferences", "value": "2:", "domain": ".oracle.com", "path": "/"},
+    {"name": "notice_gdpr_prefs", "value": "0,1,2:", "domain": ".oracle.com", "path": "/"},
+    {"name": "cmapi_cookie_privacy", "value": "permit 1,2,3", "domain": ".oracle.com", "path": "/"},
+]
+
+# Function to resolve the chromedriver binary once, reusing the cached path so later runs start without a
+# version check over the network
+def resolve_chromedriver(cache_dir=None, refresh=False):
+    path = os.path.join(cache_dir, "chromedriver.json") if cache_dir else None
+    if path and not refresh and os.path.exists(path):
+        with open(path) as file:
+            cached = json.load(file)
+        if os.path.exists(cached.get("driver_path", "")):
+            return cached["driver_path"]
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    driver_path = ChromeDriverManager().install()
+    if path:
+        write_atomically(path, json.dumps({"driver_path": driver_path,
+                                           "resolved_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}))
+    return driver_path
+
+# Function to wait until the document in the current browsing context has loaded
+def wait_for_document(driver, timeout=20):
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    WebDriverWait(driver, timeout).until(lambda d: d.execute_script("return document.readyState") == "complete")
+
 # Function to start a new WebDriver session
-def start_webdriver_session():
+def start_webdriver_session(base_url=BASE_URL, profile="default", driver_path=None):
     from selenium import webdriver
     from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.chrome.options import Options
-    from webdriver_manager.chrome import ChromeDriverManager
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
 
     options = Options()
     options.add_argument("--headless")  # Run Chrome in headless mode
@@ -325,136 +576,3046 @@ def start_webdriver_session():
     options.add_argument("--window-size=1920,1080")  # Set window size for headless mode
     options.add_argument("--no-sandbox")  # Bypass OS security model (useful for some environments)
     options.add_argument("--disable-dev-shm-usage")  # Overcome limited resource problems in some environments
+    if profile == "lean":
+        options.page_load_strategy = "eager"  # Return once the DOM is parsed, without waiting for subresources
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--mute-audio")
+
+    driver = webdriver.Chrome(service=Service(driver_path or resolve_chromedriver()), options=options)
+    if profile == "lean":
+        # Pages are opened by URL, so skip the index page, iframe, consent click, refresh and zoom
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+        for cookie in LEAN_CONSENT_COOKIES:
+            driver.execute_cdp_cmd("Network.setCookie", cookie)
+        return driver
+
+    driver.get(urljoin(base_url, "index.html"))
+    wait_for_document(driver)
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    driver.get("https://docs.oracle.com/en/cloud/saas/human-resources/25a/oedmh/index.html")
-    time.sleep(5)
-    
     # Check for iframes and switch to the correct one
     iframes = driver.find_elements(By.TAG_NAME, "iframe")
-    if len(iframes) > 1:
-        driver.switch_to.frame(iframes[1])
-    else:
-        driver.switch_to.frame(iframes[0])
-        
-    # Handle cookie consent if present
-    try:
-        accept_button = WebDriverWait(driver, 20).until(
-            EC.element_to_be_clickable((By.XPATH, "//a[@class='call' and contains(text(), 'Accept all')]"))
-        )
-        driver.execute_script("arguments[0].scrollIntoView(true);", accept_button)
-        driver.execute_script("arguments[0].click();", accept_button)
-        time.sleep(2)
-    except Exception:
-        pass
+    if iframes:
+        driver.switch_to.frame(iframes[1] if len(iframes) > 1 else iframes[0])
+
+        # Handle cookie consent if present, once the frame has loaded instead of after a fixed delay
+        try:
+            wait_for_document(driver, 10)
+            accept_button = WebDriverWait(driver, 5).until(
+                EC.element_to_be_clickable((By.XPATH, "//a[@class='call' and contains(text(), 'Accept all')]"))
+            )
+            driver.execute_script("arguments[0].scrollIntoView(true);", accept_button)
+            driver.execute_script("arguments[0].click();", accept_button)
+            WebDriverWait(driver, 5).until(EC.invisibility_of_element(accept_button))
+        except Exception:
+            pass
     driver.refresh()
-    time.sleep(2)
-    driver.execute_script("document.body.style.zoom='75%'")                     
+    wait_for_document(driver)
+    driver.execute_script("document.body.style.zoom='75%'")
     return driver
 
-# Function to process a single section in a separate browser instance
-def process_section(section):
-    section_title, table_dropdown_id, view_dropdown_id, tables_save_dir, views_save_dir = section
-    driver = start_webdriver_session()  # Start a new WebDriver session for this section
+# Function to get the extraction function of each kind of page for the Selenium engine
+def get_extract_functions(compare=False):
+    return {
+        "tables": partial(compare_extraction, kind="table") if compare else extract_data,
+        "views": partial(compare_extraction, kind="view") if compare else extract_view_data,
+    }
 
+# Function to run a long-lived browser worker that pulls individual pages from the shared queue
+def browser_worker(worker_id, task_queue, result_queue, write_queue, options, stop_event=None):
+    set_rate_limiters(options["rate_limiters"])
+    timer = StageTimer(f"browser-{worker_id}")
+    result_queue.put((worker_id, None, "session_start", []))  # Held to the session deadline until the next report
+    try:
+        with timer.stage("session_start"):
+            # Warm the browser once for every page it handles
+            driver = start_browser_session(options)
+    except Exception as e:
+        print(f"Worker {worker_id} could not start a browser: {e}")
+        timer.count("session_start_failures")
+        result_queue.put((worker_id, None, None, timer.drain()))
+        sys.exit(1)  # Lets the supervisor replace this worker
+    timer.gauge("browser_rss_mb", browser_rss_mb(driver))
+    result_queue.put((worker_id, None, None, timer.drain()))
+    output = QueuedOutput(open_output(options), write_queue, partial(result_queue.put, (worker_id, None, "writing", [])))
+    extract_functions = get_extract_functions(options["compare"])
+    pages = 0
+    last_heartbeat = time.time()
     try:
-        # Process tables dropdown if available
-        if table_dropdown_id:
+        while not (stop_event and stop_event.is_set()):
+            if time.time() - last_heartbeat >= HEARTBEAT_INTERVAL:
+                # Sent from this loop rather than a thread, so a worker stuck anywhere else goes silent
+                result_queue.put((worker_id, None, "heartbeat", []))
+                last_heartbeat = time.time()
+            try:
+                task = task_queue.get(timeout=1)
+            except queue.Empty:
+                continue  # Pages may still be requeued by the supervisor
+            if task is None:
+                break  # No pages left
+            timer.page = f"{task['section']}/{task['kind']}/{task['name']}"
+            result_queue.put((worker_id, task, "started", []))
             try:
-                print(f"Processing tables for section: {section_title}")
-                expand_dropdown_with_retries(driver, table_dropdown_id, "tables", section_title)
-                extract_all_pages(driver, table_dropdown_id, section_title, tables_save_dir, extract_data)
+                status = extract_page(driver, task, extract_functions[task["kind"]], output, options["full"], timer,
+                                      options["quiet"])
             except Exception as e:
-                print(f"Error processing tables for section {section_title}: {e}")
+                # The browser crashed: requeue only this page and carry on with a fresh browser
+                print(f"Worker {worker_id} lost its browser on {task['name']}: {e}")
+                timer.count("browser_crashes")
+                status = requeue_page(task, task_queue, output.checkpoints, output.release, f"Browser crashed: {e}", timer)
+                result_queue.put((worker_id, task, status, timer.drain()))
+                result_queue.put((worker_id, None, "session_start", []))
+                with timer.stage("session_start"):
+                    driver = refresh_driver_session(driver, options)
+                result_queue.put((worker_id, None, None, timer.drain()))
+                pages = 0
+                continue
+            pages += 1
+            rss_mb = browser_rss_mb(driver) if pages % 5 == 0 else None
+            timer.gauge("browser_rss_mb", rss_mb)
+            result_queue.put((worker_id, task, status, timer.drain()))
+            if pages >= options["recycle_pages"] or (rss_mb or 0) > options["recycle_mb"]:
+                # Long-lived browsers grow, so start over before they slow down
+                print(f"Worker {worker_id} recycling its browser after {pages} pages"
+                      f"{f' at {rss_mb:.0f} MB' if rss_mb else ''}")
+                timer.count("browser_recycles")
+                result_queue.put((worker_id, None, "session_start", []))
+                with timer.stage("session_start"):
+                    driver = refresh_driver_session(driver, options)
+                result_queue.put((worker_id, None, None, timer.drain()))
+                pages = 0
+    except Exception as e:
+        print(f"Worker {worker_id} stopped: {e}")
+        sys.exit(1)  # Lets the supervisor replace this worker
+    finally:
+        try:
+            driver.quit()  # Ensure the browser is closed after processing
+        except Exception:
+            pass  # A crashed browser may already be gone
+        output.close()
+
+# Seconds between the heartbeats of a browser worker waiting for pages or for room on the write queue, of silence
+# after which the supervisor replaces it, that starting a browser session may take, and that a worker asked to stop
+# gets before it is killed
+HEARTBEAT_INTERVAL = 5
+HEARTBEAT_TIMEOUT = 60
+SESSION_DEADLINE = 120
+STOP_GRACE = 10
+
+# Function to put a page that was interrupted back on the page queue, failing it once it was requeued too often
+def requeue_page(task, task_queue, checkpoints, release, error, timer=None, max_requeues=2):
+    task["requeues"] = task.get("requeues", 0) + 1
+    if task["requeues"] > max_requeues:
+        print(f"Giving up on page {task['name']} in section {task['section']} after {max_requeues} requeues")
+        checkpoints.mark_failed(release, task, error)
+        return "failed"
+    count_event(timer, "pages_requeued")
+    task_queue.put(task)
+    return "requeued"
+
+# Function to kill a worker process together with its chromedriver and Chrome processes
+def kill_process_tree(process):
+    try:
+        import psutil
+
+        children = psutil.Process(process.pid).children(recursive=True)
+    except Exception:
+        children = []  # Without psutil only the worker itself can be killed
+    process.kill()
+    for child in children:
+        try:
+            child.kill()
+        except Exception:
+            pass  # Already gone
+    process.join(10)
+
+# Function to measure the resident memory of a browser (chromedriver and all of its Chrome processes) in MB
+def browser_rss_mb(driver):
+    try:
+        import psutil
+
+        process = psutil.Process(driver.service.process.pid)
+        return sum(member.memory_info().rss for member in [process] + process.children(recursive=True)) / 2 ** 20
+    except Exception:
+        return None  # psutil is optional, and the browser may already be gone
+
+# Function to order page tasks so the largest sections are started first
+def order_tasks_by_section_size(tasks):
+    sections = {}
+    for task in tasks:
+        sections.setdefault(task["section"], []).append(task)
+    return [task for section_tasks in sorted(sections.values(), key=len, reverse=True) for task in section_tasks]
+
+# Class to start browser workers and to kill and replace those that crash, stop sending heartbeats while waiting
+# for pages, or overrun the page or session deadline, requeueing only the page each one was working on
+class BrowserSupervisor:
+    def __init__(self, task_queue, result_queue, write_queue, writers, options, page_deadline=240,
+                 heartbeat_timeout=HEARTBEAT_TIMEOUT, max_restarts=20, session_deadline=SESSION_DEADLINE,
+                 stop_grace=STOP_GRACE):
+        self.task_queue = task_queue
+        self.result_queue = result_queue
+        self.write_queue = write_queue
+        self.writers = writers
+        self.options = options
+        self.page_deadline = page_deadline
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_restarts = max_restarts
+        self.session_deadline = session_deadline
+        self.stop_grace = stop_grace
+        self.workers = {}
+        self.retired = set()
+        self.in_flight = {}
+        self.starting = {}
+        self.writing = {}
+        self.stopping = {}  # Worker id -> reason, kill deadline and whether to replace it
+        self.last_seen = {}
+        self.restarts = 0
+
+    # Function to start one more browser worker
+    def start_worker(self):
+        worker_id = len(self.workers)
+        stop_event = Event()
+        worker = Process(target=browser_worker,
+                         args=(worker_id, self.task_queue, self.result_queue, self.write_queue, self.options, stop_event))
+        worker.start()
+        self.workers[worker_id] = (worker, stop_event)
+        self.last_seen[worker_id] = time.time()
+        self.starting[worker_id] = time.time()
+
+    # Function to get the ids of the workers that are running and not asked to stop
+    def active_workers(self):
+        return [worker_id for worker_id, (worker, stop_event) in self.workers.items()
+                if worker.is_alive() and not stop_event.is_set()]
+
+    def any_alive(self):
+        return any(worker.is_alive() for worker, _ in self.workers.values())
+
+    # Function to note a message from a worker: a heartbeat, a session it is starting, a page it is waiting to hand
+    # to the writers, or a page it started or finished
+    def record(self, worker_id, task, status):
+        self.last_seen[worker_id] = time.time()
+        if status == "session_start":
+            self.starting[worker_id] = time.time()
         else:
-            print(f"Skipping tables for section: {section_title} as no tables dropdown is defined.")
+            self.starting.pop(worker_id, None)
+        if status == "writing":
+            self.writing[worker_id] = time.time()
+        elif task is not None:
+            self.writing.pop(worker_id, None)
+        if status == "started":
+            self.in_flight[worker_id] = (task, time.time())
+        elif task is not None:
+            self.in_flight.pop(worker_id, None)
 
-        # Process views dropdown if available
-        if view_dropdown_id:
+    # Function to replace the workers that crashed, hung or went silent, returning the pages requeued too often;
+    # drain takes in the reports still waiting, which a worker that exited cleanly sent before exiting
+    def check(self, checkpoints, metrics, drain=None):
+        now = time.time()
+        failed = []
+        for worker_id, (worker, stop_event) in list(self.workers.items()):
+            if worker_id in self.retired:
+                continue
+            task, started = self.in_flight.get(worker_id, (None, None))
+            if worker_id in self.stopping:
+                if worker.is_alive() and now < self.stopping[worker_id][1]:
+                    continue  # Still in its grace period
+                reason, _, replace = self.stopping.pop(worker_id)
+                if worker.is_alive():
+                    print(f"Browser worker {worker_id} did not stop within {self.stop_grace:.0f}s")
+                elif drain:
+                    drain()  # It may have finished its page before exiting
+                    task, started = self.in_flight.get(worker_id, (None, None))
+            elif not worker.is_alive():
+                if worker.exitcode == 0 and task is not None and drain:
+                    drain()  # Its report on the page it finished may still be waiting
+                    task, started = self.in_flight.get(worker_id, (None, None))
+                if worker.exitcode == 0 and task is None:
+                    self.retired.add(worker_id)  # Finished, or asked to stop by the controller
+                    continue
+                reason, replace = f"exited with code {worker.exitcode}", not stop_event.is_set()
+            else:
+                if task is not None:
+                    if now - started <= self.page_deadline or \
+                            now - self.writing.get(worker_id, 0) <= self.heartbeat_timeout:
+                        continue  # Extracting, or handing its page to writers that are behind
+                    reason = f"spent over {self.page_deadline:.0f}s on {task['name']}"
+                elif worker_id in self.starting:
+                    if now - self.starting[worker_id] <= self.session_deadline:
+                        continue
+                    reason = f"spent over {self.session_deadline:.0f}s starting a browser session"
+                elif now - self.last_seen[worker_id] > self.heartbeat_timeout:
+                    reason = f"sent no heartbeat for {now - self.last_seen[worker_id]:.0f}s"
+                else:
+                    continue
+                # Killing a worker in the middle of a queue operation can corrupt the shared queues, so ask it to
+                # stop first and kill it only once the grace period is over
+                print(f"Browser worker {worker_id} {reason}; stopping it")
+                self.stopping[worker_id] = (reason, now + self.stop_grace, not stop_event.is_set())
+                stop_event.set()
+                continue
+
+            print(f"Browser worker {worker_id} {reason}; replacing it")
+            kill_process_tree(worker)  # Also takes down the browser of a worker that already exited
+            self.retired.add(worker_id)
+            self.in_flight.pop(worker_id, None)
+            self.starting.pop(worker_id, None)
+            self.writing.pop(worker_id, None)
+            metrics.counters["worker_restarts"] += 1
+            if task is not None:
+                if requeue_page(task, self.task_queue, checkpoints, self.options["release"],
+                                f"Browser worker {reason}") == "failed":
+                    failed.append(task)
+                else:
+                    metrics.counters["pages_requeued"] += 1
+            if replace and self.restarts < self.max_restarts:
+                self.restarts += 1
+                self.start_worker()
+        return failed
+
+    # Function to let every running worker finish and exit, killing those still running after the timeout;
+    # discard_pages empties the write queue too, for a consumer that no longer reads it, and handle takes the
+    # reports that arrive meanwhile instead of only merging their events
+    def stop(self, metrics, timeout=60, discard_pages=False, handle=None):
+        for _ in self.active_workers():
+            self.task_queue.put(None)  # One stop marker per worker still taking pages
+        for _, stop_event in self.workers.values():
+            stop_event.set()
+        # Keep reading reports while the workers exit, since a process only exits once its queued reports are read
+        deadline = time.time() + timeout
+        while self.any_alive() and time.time() < deadline:
+            try:
+                report = self.result_queue.get(timeout=0.1)
+                if handle:
+                    handle(*report)
+                else:
+                    metrics.merge(report[3])
+            except queue.Empty:
+                pass
+            while discard_pages:
+                try:
+                    self.write_queue.get_nowait()
+                except queue.Empty:
+                    break
+        for worker_id, (worker, _) in self.workers.items():
+            if worker.is_alive():
+                print(f"Browser worker {worker_id} did not stop within {timeout:.0f}s; killing it")
+                kill_process_tree(worker)
+            worker.join()
+
+# Function to start the writers and a number of browser workers waiting for pages
+def start_browser_pool(options, workers):
+    task_queue, result_queue = Queue(), Queue()
+    write_queue, writers = start_writers(options, result_queue, use_processes=True)
+    supervisor = BrowserSupervisor(task_queue, result_queue, write_queue, writers, options, options["page_deadline"])
+    for _ in range(workers):
+        supervisor.start_worker()  # Browsers start in parallel, each in its own process
+    return supervisor
+
+# Function to stop the browsers and writers of a pool and merge their last reports
+def stop_browser_pool(supervisor, metrics):
+    supervisor.stop(metrics)
+    stop_writers(supervisor.write_queue, supervisor.writers)
+    drain_results(supervisor.result_queue, metrics)
+
+# Function to process pages on a pool of warm browsers sharing one page queue, optionally resized at runtime,
+# using browsers already started with start_browser_pool when given, and leaving them running for the next pages
+# when keep_pool is set
+def process_pages_with_browser_pool(tasks, options, metrics, pool_size=15, controller=None, supervisor=None,
+                                    keep_pool=False):
+    max_workers = min(controller.maximum if controller else pool_size, len(tasks))
+    initial_workers = min(controller.target if controller else pool_size, max_workers)
+    supervisor = supervisor or start_browser_pool(options, initial_workers)
+    if not keep_pool:
+        for worker_id in supervisor.active_workers()[initial_workers:]:
+            supervisor.workers[worker_id][1].set()  # Started before the pages were known, but not needed
+    task_queue, result_queue = supervisor.task_queue, supervisor.result_queue
+    for task in order_tasks_by_section_size(tasks):
+        task_queue.put(task)
+    checkpoints = CheckpointStore(options["checkpoint_path"])
+
+    remaining = len(tasks)
+    pages = {f"{task['section']}/{task['kind']}/{task['name']}" for task in tasks}
+    finished, written, received = set(), set(), set()
+
+    # Helper function to take in one report from a worker or writer
+    def handle(worker_id, task, status, events):
+        nonlocal remaining
+        metrics.merge(events)
+        supervisor.record(worker_id, task, status)
+        page = task and f"{task['section']}/{task['kind']}/{task['name']}"
+        if status == "received":
+            received.add(page)
+        elif status in ("saved", "save_failed"):
+            metrics.page_saved(task, status == "saved")
+        elif task is not None and status not in ("started", "requeued") and page in pages and page not in finished:
+            finished.add(page)  # A page finished just before its worker was replaced is only counted once
+            if status == "written":
+                written.add(page)
+                metrics.page_handed(task)  # Counted as written once a writer saved it
+            else:
+                metrics.page_done(status)
+            remaining -= 1
+            print(f"Worker {worker_id} finished {task['name']} ({status}); {remaining} of {len(tasks)} pages left")
+            if controller:
+                controller.record_page(events, status)
+
+    # Helper function to take in every report that is already waiting
+    def drain():
+        while True:
+            try:
+                handle(*result_queue.get_nowait())
+            except queue.Empty:
+                return
+
+    try:
+        drain()  # Heartbeats sent while a kept pool waited for pages
+        while remaining > 0:
             try:
-                print(f"Processing views for section: {section_title}")
-                expand_dropdown_with_retries(driver, view_dropdown_id, "views", section_title)
-                extract_all_pages(driver, view_dropdown_id, section_title, views_save_dir, extract_view_data)
+                handle(*result_queue.get(timeout=1))
+            except queue.Empty:
+                pass
+            metrics.export_if_due()
+            for task in supervisor.check(checkpoints, metrics, drain):
+                page = f"{task['section']}/{task['kind']}/{task['name']}"
+                if page not in finished:
+                    finished.add(page)  # A late report from the killed worker must not count it again
+                    metrics.page_done("failed")
+                    remaining -= 1
+            if controller and controller.due():
+                active = supervisor.active_workers()
+                target = min(controller.decide(len(active), metrics), remaining)
+                for _ in range(max(0, target - len(active))):
+                    supervisor.start_worker()
+                for worker_id in sorted(active, reverse=True)[:max(0, len(active) - target)]:
+                    supervisor.workers[worker_id][1].set()  # Finishes its current page, then exits
+                metrics.gauges["target_workers"]["controller"] = max(target, 1)
+            if remaining and not supervisor.any_alive():
+                print(f"All browser workers exited with {remaining} pages left.")
+                metrics.statuses["failed"] += remaining
+                break
+        if keep_pool:
+            # A worker reports a page before its handover to the writers may arrive, and the writers are about to
+            # be stopped while the workers keep running, so wait until the writers took every written page
+            deadline = time.time() + 60
+            while not written <= received and time.time() < deadline:
+                try:
+                    handle(*result_queue.get(timeout=0.1))
+                except queue.Empty:
+                    pass
+        else:
+            supervisor.stop(metrics, handle=handle)
+    finally:
+        checkpoints.close()
+        stop_writers(supervisor.write_queue, supervisor.writers)
+        # The writers have flushed, so they confirmed every page they saved or failed to save
+        while True:
+            try:
+                handle(*result_queue.get(timeout=0.1))
+            except queue.Empty:
+                break
+        metrics.settle_writes()
+        if keep_pool:
+            # Fresh writers take the next pages
+            _, supervisor.writers = start_writers(options, result_queue, True, supervisor.write_queue)
+
+# Class to adjust the number of browser workers to measured browser memory, free memory, CPU load,
+# page latency and error rate between a minimum and a maximum
+class ConcurrencyController:
+    def __init__(self, minimum=1, maximum=15, initial=None, interval=30, max_error_rate=0.1,
+                 latency_factor=2.0, memory_reserve_mb=1024, default_browser_mb=500, baseline_weight=0.3):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.target = min(max(initial or self.minimum, self.minimum), self.maximum)
+        self.interval = interval
+        self.max_error_rate = max_error_rate
+        self.latency_factor = latency_factor
+        self.memory_reserve_mb = memory_reserve_mb
+        self.default_browser_mb = default_browser_mb
+        self.baseline_weight = baseline_weight
+        self.window = []
+        self.window_started = time.time()
+        self.baseline_latency = None  # Moving average of recent windows, so one fast window is not the bar for good
+        self.last_throughput = None
+        self.scaled_up = False
+
+    # Function to record the latency and errors of a finished page from its timer events; pages skipped as unchanged
+    # only took a revalidation request, so they say nothing about how fast pages are extracted
+    def record_page(self, events, status):
+        if status not in ("written", "failed"):
+            return
+        seconds = sum(event[4] for event in events if event[0] == "stage")
+        errors = sum(event[3] for event in events
+                     if event[0] == "count" and event[2] in ("page_errors", "wait_timeouts", "stale_elements"))
+        self.window.append((seconds, status == "failed" or errors > 0))
+
+    def due(self):
+        return time.time() - self.window_started >= self.interval and len(self.window) >= 3
+
+    # Function to pick the next worker count from the measurements of the last interval
+    def decide(self, active, metrics):
+        elapsed = time.time() - self.window_started
+        throughput = len(self.window) / elapsed
+        latency = percentile([seconds for seconds, _ in self.window], 0.5)
+        error_rate = sum(1 for _, failed in self.window if failed) / len(self.window)
+        baseline = self.baseline_latency if self.baseline_latency is not None else latency
+        self.baseline_latency = baseline + self.baseline_weight * (latency - baseline)
+        browser_mb = max([value for value in metrics.gauges["browser_rss_mb"].values() if value] or [self.default_browser_mb])
+        free_mb = available_memory_mb()
+        load = cpu_load()
+
+        reason = None
+        if error_rate > self.max_error_rate:
+            reason = f"error rate {error_rate:.0%}"
+        elif latency > baseline * self.latency_factor:
+            reason = f"page latency {latency:.1f}s vs recent {baseline:.1f}s"
+        elif free_mb is not None and free_mb < self.memory_reserve_mb:
+            reason = f"only {free_mb:.0f} MB free"
+        elif load is not None and load > 1.5:
+            reason = f"CPU load {load:.2f} per core"
+        if reason:
+            self.target = max(self.minimum, min(self.target, active) - max(1, active // 4))
+            print(f"Scaling browser workers down to {self.target}: {reason}")
+        elif self.scaled_up and self.last_throughput and throughput < self.last_throughput * 1.05:
+            print(f"Holding browser workers at {self.target}: throughput stopped improving ({throughput:.2f} pages/sec)")
+        elif (self.target < self.maximum and (free_mb is None or free_mb - browser_mb > self.memory_reserve_mb)
+              and (load is None or load < 1.0)):
+            self.target += 1
+            print(f"Scaling browser workers up to {self.target}: {throughput:.2f} pages/sec, "
+                  f"{browser_mb:.0f} MB per browser, {'unknown' if free_mb is None else f'{free_mb:.0f} MB'} free")
+        self.scaled_up = not reason and self.target > active
+        self.last_throughput = throughput
+        self.window = []
+        self.window_started = time.time()
+        return self.target
+
+# Function to get the available system memory in MB, or None when it cannot be measured
+def available_memory_mb():
+    try:
+        import psutil
+
+        return psutil.virtual_memory().available / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo") as file:
+            for line in file:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+# Function to get the one-minute load average per CPU core, or None where the platform has none
+def cpu_load():
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+# Class to cap the request rate to one host across every worker thread and process
+class HostRateLimiter:
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second
+        self.next_allowed = Value("d", 0.0)
+
+    def acquire(self):
+        with self.next_allowed.get_lock():
+            now = time.time()
+            wait = max(0.0, self.next_allowed.value - now)
+            self.next_allowed.value = max(now, self.next_allowed.value) + self.interval
+        if wait:
+            time.sleep(wait)
+
+# Rate limiters of the current process by host, installed by each worker at start
+rate_limiters = {}
+
+# Function to install the per-host rate limiters in the current process
+def set_rate_limiters(limiters):
+    rate_limiters.clear()
+    rate_limiters.update(limiters or {})
+
+# Function to wait for the rate limiter of a URL's host, if it has one
+def throttle(url):
+    limiter = rate_limiters.get(urlsplit(url).netloc)
+    if limiter:
+        limiter.acquire()
+
+# Class to hand extracted pages to the writer stage instead of writing them in the extracting worker
+class QueuedOutput:
+    def __init__(self, output, write_queue, heartbeat=None):
+        self.output = output
+        self.checkpoints = output.checkpoints
+        self.release = output.release
+        self.write_queue = write_queue
+        self.heartbeat = heartbeat
+
+    def has_page(self, task):
+        return self.output.has_page(task)
+
+    def write(self, task, data, digest, validators, timer=None):
+        with timed(timer, "enqueue"):
+            while True:
+                try:
+                    self.write_queue.put((task, data, digest, validators), timeout=HEARTBEAT_INTERVAL)
+                    return
+                except queue.Full:
+                    if self.heartbeat:
+                        self.heartbeat()  # The writers are behind; tell the supervisor this worker is still alive
+
+    def close(self):
+        self.output.close()
+
+# Function to run a writer that persists extracted pages from the write queue until it receives a stop marker,
+# reporting each page it takes and each page it saved or failed to save once its batch is flushed
+def page_writer(writer_id, write_queue, result_queue, options):
+    timer = StageTimer(f"writer-{writer_id}")
+    output = open_output(options)
+    output.flushed = []
+
+    # Helper function to report the pages flushed since the last report
+    def report_flushed():
+        for task, status in output.flushed:
+            result_queue.put((f"writer-{writer_id}", task, status, []))
+        output.flushed.clear()
+
+    try:
+        while True:
+            item = write_queue.get()
+            if item is None:
+                break  # Every page has been handed over
+            task, data, digest, validators = item
+            timer.page = f"{task['section']}/{task['kind']}/{task['name']}"
+            try:
+                output.write(task, data, digest, validators, timer)
             except Exception as e:
-                print(f"Error processing views for section {section_title}: {e}")
+                print(f"Writer {writer_id} could not save pages: {e}")
+                timer.count("write_failures")
+            result_queue.put((f"writer-{writer_id}", task, "received", timer.drain()))
+            report_flushed()
+    finally:
+        timer.page = None
+        try:
+            output.close(timer)  # Flush the last batch
+        except Exception as e:
+            print(f"Writer {writer_id} could not save its last pages: {e}")
+            timer.count("write_failures")
+        report_flushed()
+        result_queue.put((f"writer-{writer_id}", None, None, timer.drain()))
+
+# Function to start the writer stage behind a bounded queue: processes next to browser workers, threads for HTTP
+def start_writers(options, result_queue, use_processes, write_queue=None):
+    if use_processes:
+        write_queue = write_queue or Queue(maxsize=options["write_queue_size"])
+        writers = [Process(target=page_writer, args=(writer_id, write_queue, result_queue, options))
+                   for writer_id in range(options["writers"])]
+    else:
+        write_queue = write_queue or queue.Queue(maxsize=options["write_queue_size"])
+        writers = [threading.Thread(target=page_writer, args=(writer_id, write_queue, result_queue, options),
+                                    name=f"writer-{writer_id}")
+                   for writer_id in range(options["writers"])]
+    for writer in writers:
+        writer.start()
+    return write_queue, writers
+
+# Function to let the writers flush every queued page and stop
+def stop_writers(write_queue, writers):
+    for _ in writers:
+        write_queue.put(None)  # One stop marker per writer, queued behind the remaining pages
+    for writer in writers:
+        writer.join()
+
+# Function to merge the reports still waiting in the result queue and count the pages the writers confirmed
+def drain_results(result_queue, metrics, timeout=0.1):
+    while True:
+        try:
+            _, task, status, events = result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return
+        metrics.merge(events)
+        if status in ("saved", "save_failed"):
+            metrics.page_saved(task, status == "saved")
+
+# Class to time the stages of the pages a worker processes and count its retry and error events
+class StageTimer:
+    def __init__(self, worker):
+        self.worker = worker
+        self.page = None
+        self.events = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append(("stage", self.worker, self.page, name, time.perf_counter() - start))
+
+    def count(self, event, amount=1):
+        self.events.append(("count", self.worker, event, amount))
+
+    def gauge(self, name, value):
+        if value is not None:
+            self.events.append(("gauge", self.worker, name, value))
+
+    # Function to hand over the events recorded so far, e.g. to send them to the parent process
+    def drain(self):
+        events, self.events = self.events, []
+        return events
+
+# Function to time a stage when a timer is given
+def timed(timer, name):
+    return timer.stage(name) if timer else nullcontext()
+
+# Function to count an event when a timer is given
+def count_event(timer, event, amount=1):
+    if timer:
+        timer.count(event, amount)
+
+# Function to get a nearest-rank percentile of a list of durations
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+# Function to summarise a list of stage durations
+def summarize_durations(values):
+    return {
+        "count": len(values),
+        "total": sum(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": max(values),
+    }
+
+# Class to aggregate the timer events of every worker into a run report and a live Prometheus textfile
+class RunMetrics:
+    def __init__(self, prometheus_path=None, export_interval=10):
+        self.started = time.time()
+        self.stages = defaultdict(list)
+        self.worker_stages = defaultdict(lambda: defaultdict(list))
+        self.page_seconds = defaultdict(float)
+        self.counters = Counter()
+        self.gauges = defaultdict(dict)
+        self.statuses = Counter()
+        self.handed, self.confirmed = set(), {}
+        self.first_page_at = None
+        self.prometheus_path = prometheus_path
+        self.export_interval = export_interval
+        self.last_export = 0
+
+    def merge(self, events):
+        for event in events:
+            if event[0] == "stage":
+                _, worker, page, stage, seconds = event
+                self.stages[stage].append(seconds)
+                self.worker_stages[worker][stage].append(seconds)
+                if page:
+                    self.page_seconds[page] += seconds
+            elif event[0] == "gauge":
+                _, worker, name, value = event
+                self.gauges[name][worker] = value
+            else:
+                _, worker, name, amount = event
+                self.counters[name] += amount
+
+    def page_done(self, status):
+        self.statuses[status] += 1
+        if self.first_page_at is None:
+            self.first_page_at = time.time()
+        self.export_if_due()
+
+    # Function to note a page handed to the writers, which counts towards the time to the first page but is only
+    # counted as written once a writer confirms it saved the page; the confirmation may arrive first
+    def page_handed(self, task):
+        key = (task["section"], task["kind"], task["name"])
+        if self.first_page_at is None:
+            self.first_page_at = time.time()
+        if key in self.confirmed:
+            self.page_done("written" if self.confirmed.pop(key) else "failed")
         else:
-            print(f"Skipping views for section: {section_title} as no views dropdown is defined.")
+            self.handed.add(key)
+
+    # Function to count a page a writer saved or failed to save
+    def page_saved(self, task, saved):
+        key = (task["section"], task["kind"], task["name"])
+        if key in self.handed:
+            self.handed.remove(key)
+            self.page_done("written" if saved else "failed")
+        else:
+            self.confirmed[key] = saved  # Counted once the page is reported handed over
+
+    # Function to count the pages handed to the writers that no writer confirmed as failed, once the writers have
+    # stopped, and start over for the next pages
+    def settle_writes(self):
+        for _ in self.handed:
+            self.page_done("failed")
+            self.counters["pages_not_saved"] += 1
+        self.handed, self.confirmed = set(), {}
+
+    def elapsed(self):
+        return time.time() - self.started
+
+    def pages_per_second(self):
+        return sum(self.statuses.values()) / max(self.elapsed(), 1e-6)
+
+    def summary(self, **extra):
+        slowest = sorted(self.page_seconds.items(), key=lambda item: item[1], reverse=True)[:20]
+        return {
+            **extra,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started)),
+            "elapsed_seconds": self.elapsed(),
+            "pages": dict(self.statuses),
+            "pages_per_second": self.pages_per_second(),
+            "startup": {
+                "first_page_at": self.first_page_at,
+                "run_started_after_seconds": self.started - SCRIPT_STARTED,
+                "time_to_first_page_seconds": self.first_page_at - SCRIPT_STARTED if self.first_page_at else None,
+                "session_start": summarize_durations(self.stages["session_start"]) if "session_start" in self.stages else None,
+            },
+            "stages": {stage: summarize_durations(values) for stage, values in self.stages.items()},
+            "workers": {worker: {stage: summarize_durations(values) for stage, values in stages.items()}
+                        for worker, stages in self.worker_stages.items()},
+            "events": dict(self.counters),
+            "gauges": {name: dict(values) for name, values in self.gauges.items()},
+            "slowest_pages": [{"page": page, "seconds": seconds} for page, seconds in slowest],
+        }
+
+    # Function to write the machine-readable run report, plus a final Prometheus export
+    def write_report(self, path, **extra):
+        report = self.summary(**extra)
+        write_atomically(path, json.dumps(report, indent=1))
+        print(f"Wrote run report to {path}")
+        if self.prometheus_path:
+            self.export_prometheus()
+        return report
+
+    def export_if_due(self):
+        if self.prometheus_path and time.time() - self.last_export >= self.export_interval:
+            self.export_prometheus()
+
+    # Function to write the current metrics in the Prometheus textfile collector format
+    def export_prometheus(self):
+        lines = [
+            "# HELP oracle_scrape_pages_total Pages processed by status.",
+            "# TYPE oracle_scrape_pages_total counter",
+        ]
+        lines += [f'oracle_scrape_pages_total{{status="{status}"}} {count}' for status, count in self.statuses.items()]
+        lines += [
+            "# HELP oracle_scrape_pages_per_second Pages processed per second since the run started.",
+            "# TYPE oracle_scrape_pages_per_second gauge",
+            f"oracle_scrape_pages_per_second {self.pages_per_second():.6f}",
+            "# HELP oracle_scrape_events_total Retries, stale elements, timeouts and errors.",
+            "# TYPE oracle_scrape_events_total counter",
+        ]
+        lines += [f'oracle_scrape_events_total{{event="{event}"}} {count}' for event, count in self.counters.items()]
+        for name, values in self.gauges.items():
+            lines.append(f"# TYPE oracle_scrape_{name} gauge")
+            lines += [f'oracle_scrape_{name}{{worker="{worker}"}} {value}' for worker, value in values.items()]
+        lines += [
+            "# HELP oracle_scrape_stage_seconds Time spent per page in each stage.",
+            "# TYPE oracle_scrape_stage_seconds summary",
+        ]
+        for stage, values in self.stages.items():
+            for quantile in (0.5, 0.95, 0.99):
+                lines.append(f'oracle_scrape_stage_seconds{{stage="{stage}",quantile="{quantile}"}} {percentile(values, quantile):.6f}')
+            lines.append(f'oracle_scrape_stage_seconds_sum{{stage="{stage}"}} {sum(values):.6f}')
+            lines.append(f'oracle_scrape_stage_seconds_count{{stage="{stage}"}} {len(values)}')
+        write_atomically(self.prometheus_path, "\n".join(lines) + "\n")
+        self.last_export = time.time()
+
+# Function to replace a file in one step so readers never see it half written
+def write_atomically(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # Workers may replace the same file at once
+    with open(temp_path, "w") as file:
+        file.write(text)
+    os.replace(temp_path, path)
+
+# Function to build one task per page of the selected manifest sections
+def build_page_tasks(sections, directories):
+    tasks = []
+    for section in sections:
+        for kind in ("tables", "views"):
+            tasks += [{"section": section["name"], "kind": kind, "name": page["name"], "url": page["url"],
+                       "save_dir": directories[section["name"]][kind]} for page in section[kind]]
+    return tasks
+
+# Function to get the Excel file a page task is saved to
+def page_save_path(task):
+    return os.path.join(task["save_dir"], f'{task["name"].lower()}.xlsx')
+
+# Function to hash extracted page data so unchanged pages are recognised between runs
+def content_hash(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+# Class to record per-page progress in SQLite so interrupted or repeated runs only redo new, changed or failed pages
+class CheckpointStore:
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                release TEXT NOT NULL,
+                section TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                page TEXT NOT NULL,
+                status TEXT NOT NULL,
+                content_hash TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                error TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (release, section, kind, page)
+            )""")
+        self.connection.commit()
+
+    # Function to get the checkpoint of a page, or None if it was never attempted
+    def get(self, release, task):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT * FROM pages WHERE release = ? AND section = ? AND kind = ? AND page = ?",
+                (release, task["section"], task["kind"], task["name"])).fetchone()
+        return dict(row) if row else None
+
+    # Function to insert or replace the checkpoint of a page
+    def put(self, release, task, status, content_hash=None, etag=None, last_modified=None, error=None):
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (release, task["section"], task["kind"], task["name"], status, content_hash, etag, last_modified,
+                 error, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())))
+            self.connection.commit()
+
+    # Function to record a page as extracted and saved
+    def mark_done(self, release, task, content_hash, etag=None, last_modified=None):
+        self.put(release, task, "done", content_hash, etag, last_modified)
+
+    # Function to record a page as failed, keeping its last good hash and validators
+    def mark_failed(self, release, task, error):
+        previous = self.get(release, task) or {}
+        self.put(release, task, "failed", previous.get("content_hash"), None, None, error)
+
+    def close(self):
+        self.connection.close()
+
+# Function to check whether a checkpointed page is done and its output still exists
+def checkpoint_is_current(checkpoint, task, output):
+    return checkpoint is not None and checkpoint["status"] == "done" and output.has_page(task)
+
+# Function to save extracted page data, skipping the write when it matches the checkpointed content
+def save_page(task, data, output, checkpoint=None, validators=None, timer=None):
+    validators = validators or {}
+    digest = content_hash(data)
+    if checkpoint is not None and checkpoint["content_hash"] == digest:
+        output.checkpoints.mark_done(output.release, task, digest, validators.get("etag"), validators.get("last_modified"))
+        return "unchanged"
+    output.write(task, data, digest, validators, timer)
+    return "written"
+
+# Function to split a page into rows of the normalised output datasets
+def normalize_page(release, task, data):
+    key = {"release": release, "section": task["section"], "kind": task["kind"], "page": task["name"]}
+    rows = {dataset: [] for dataset in DATASETS}
+    if task["kind"] == "tables":
+        rows["tables"].append({**key, "header": data["header"], "paragraph": data.get("paragraph"),
+                               "details": json.dumps(data["details"]),
+                               "columns_headers": json.dumps(data.get("columns_headers", [])),
+                               "indexes_headers": json.dumps(data.get("indexes_headers", [])),
+                               "foreign_keys_headers": json.dumps(data.get("foreign_keys_headers", []))})
+        rows["primary_keys"] = [{**key, "position": position, "name": row[0], "columns": row[1]}
+                                for position, row in enumerate(data.get("primary_key", []))]
+        rows["indexes"] = [{**key, "position": position, "name": row[0] if row else None, "cells": json.dumps(row)}
+                           for position, row in enumerate(data.get("indexes", []))]
+        headers = data.get("foreign_keys_headers", [])
+        rows["foreign_keys"] = [{**key, "position": position,
+                                 "table_name": header_cell(row, headers, "Table", 0),
+                                 "foreign_table": header_cell(row, headers, "Foreign Table", 1),
+                                 "foreign_key_column": header_cell(row, headers, "Foreign Key Column", 2),
+                                 "cells": json.dumps(row)}
+                                for position, row in enumerate(data.get("foreign_keys", []))]
+    else:
+        rows["views"].append({**key, "header": data["header"], "details": json.dumps(data["details"]),
+                              "columns_headers": json.dumps(data.get("columns_headers", [])),
+                              "query_headers": json.dumps(data.get("query_headers", []))})
+        rows["view_queries"] = [{**key, "position": position, "query": "\n".join(row), "cells": json.dumps(row)}
+                                for position, row in enumerate(data.get("query", []))]
+    rows["columns"] = [{**key, "position": position, "name": row[0] if row else None, "cells": json.dumps(row)}
+                       for position, row in enumerate(data.get("columns", []))]
+    return rows
+
+# Helper function to read a cell by its header name, falling back to its usual position
+def header_cell(row, headers, name, default_index):
+    index = headers.index(name) if name in headers else default_index
+    return row[index] if index < len(row) else None
+
+# Function to rebuild the page data of one page from its rows in the normalised datasets
+def denormalize_page(kind, rows):
+    page = rows["tables" if kind == "tables" else "views"][0]
+    data = {"header": page["header"], "details": json.loads(page["details"])}
+    by_position = {dataset: sorted(rows.get(dataset, []), key=lambda row: row["position"])
+                   for dataset, columns in DATASETS.items() if "position" in columns}
+    data["columns"] = [json.loads(row["cells"]) for row in by_position["columns"]]
+    data["columns_headers"] = json.loads(page["columns_headers"])
+    if kind == "tables":
+        data["paragraph"] = page["paragraph"]
+        data["primary_key"] = [[row["name"], row["columns"]] for row in by_position["primary_keys"]]
+        data["indexes"] = [json.loads(row["cells"]) for row in by_position["indexes"]]
+        data["indexes_headers"] = json.loads(page["indexes_headers"])
+        data["foreign_keys"] = [json.loads(row["cells"]) for row in by_position["foreign_keys"]]
+        data["foreign_keys_headers"] = json.loads(page["foreign_keys_headers"])
+    else:
+        data["query"] = [json.loads(row["cells"]) for row in by_position["view_queries"]]
+        data["query_headers"] = json.loads(page["query_headers"])
+    return data
+
+# Class to save pages and mark them done once they are persisted; subclasses buffer pages into batches
+class PageOutput:
+    batch_size = 1
+
+    def __init__(self, checkpoints, release=DEFAULT_RELEASE):
+        self.checkpoints = checkpoints
+        self.release = release
+        self.search = None
+        self.pending = []
+        self.flushed = None  # A list to collect (task, "saved" or "save_failed") for each flushed page, when set
+        self.lock = threading.RLock()
+
+    def write(self, task, data, digest, validators, timer=None):
+        with self.lock:
+            self.pending.append((task, data, digest, validators))
+            if len(self.pending) >= self.batch_size:
+                self.flush(timer)
+
+    # Function to persist the pending pages and only then checkpoint them as done
+    def flush(self, timer=None):
+        with self.lock:
+            pending, self.pending = self.pending, []
+            if not pending:
+                return
+            try:
+                self.write_batch(pending, timer)
+            except Exception as e:
+                for task, _, _, _ in pending:
+                    self.checkpoints.mark_failed(self.release, task, f"Could not write output: {e}")
+                    if self.flushed is not None:
+                        self.flushed.append((task, "save_failed"))
+                raise
+            if self.search is not None:
+                with timed(timer, "index"):
+                    self.search.update([(self.release, task["section"], task["kind"], task["name"], data, digest)
+                                        for task, data, digest, _ in pending])
+            for task, _, digest, validators in pending:
+                self.checkpoints.mark_done(self.release, task, digest, validators.get("etag"), validators.get("last_modified"))
+                if self.flushed is not None:
+                    self.flushed.append((task, "saved"))
+
+    def close(self, timer=None):
+        try:
+            self.flush(timer)
+        finally:
+            self.checkpoints.close()
+            if self.search is not None:
+                self.search.close()
+
+# Class to save every page as its own multi-sheet workbook, as the script always has
+class ExcelOutput(PageOutput):
+    def __init__(self, checkpoints, release=DEFAULT_RELEASE):
+        super().__init__(checkpoints, release)
+        # Workbooks are saved without the release in their path, so one directory only ever holds one release
+        with checkpoints.lock:
+            other = checkpoints.connection.execute(
+                "SELECT release FROM pages WHERE release != ? LIMIT 1", (release,)).fetchone()
+        if other:
+            checkpoints.close()
+            raise ValueError(f"The output directory holds the workbooks of release {other[0]}; "
+                             f"save release {release} to another directory")
+
+    def has_page(self, task):
+        return os.path.exists(page_save_path(task))
+
+    def write_batch(self, pages, timer=None):
+        for task, data, _, _ in pages:
+            save_to_excel(data, page_save_path(task), timer)
+
+# Class to append pages to the normalised datasets of one SQLite database
+class SqliteOutput(PageOutput):
+    batch_size = 200
+
+    def __init__(self, checkpoints, release, path):
+        super().__init__(checkpoints, release)
+        self.connection = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        create_store_schema(self.connection)
+
+    def has_page(self, task):
+        with self.lock:
+            return self.connection.execute(
+                "SELECT 1 FROM pages WHERE release = ? AND section = ? AND kind = ? AND page = ?",
+                (self.release, task["section"], task["kind"], task["name"])).fetchone() is not None
+
+    def write_batch(self, pages, timer=None):
+        with timed(timer, "serialize"):
+            batches = defaultdict(list)
+            for task, data, digest, _ in pages:
+                for dataset, rows in normalize_page(self.release, task, data).items():
+                    batches[dataset] += rows
+                batches["pages"].append({"release": self.release, "section": task["section"], "kind": task["kind"],
+                                         "page": task["name"], "content_hash": digest,
+                                         "written_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())})
+        with timed(timer, "write"), self.connection:
+            keys = [(self.release, task["section"], task["kind"], task["name"]) for task, _, _, _ in pages]
+            for dataset in STORE_DATASETS:
+                self.connection.executemany(
+                    f'DELETE FROM "{dataset}" WHERE release = ? AND section = ? AND kind = ? AND page = ?', keys)
+                insert_rows(self.connection, dataset, batches[dataset])
+
+    def close(self, timer=None):
+        try:
+            super().close(timer)
+        finally:
+            self.connection.close()
+
+# Class to append pages to the normalised datasets as Parquet files partitioned by release
+class ParquetOutput(PageOutput):
+    batch_size = 500
+
+    def __init__(self, checkpoints, release, directory):
+        super().__init__(checkpoints, release)
+        self.directory = directory
+        self.part = 0
+        self.pages = None
+
+    def has_page(self, task):
+        with self.lock:
+            if self.pages is None:
+                # Read the keys of the pages of this release once, then keep them up to date in write_batch
+                self.pages = set()
+                partition = os.path.join(self.directory, "pages", f"release={self.release}")
+                if os.path.isdir(partition):
+                    import pyarrow.dataset as ds
+
+                    keys = ds.dataset(partition, format="parquet").to_table(columns=["section", "kind", "page"])
+                    self.pages = set(zip(*(keys.column(name).to_pylist() for name in ("section", "kind", "page"))))
+            return (task["section"], task["kind"], task["name"]) in self.pages
+
+    def write_batch(self, pages, timer=None):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.part += 1
+        batch = f"{int(time.time() * 1000)}-{os.getpid()}-{self.part}"  # Sorts in write order
+        with timed(timer, "serialize"):
+            written_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            batches = defaultdict(list)
+            for task, data, digest, _ in pages:
+                for dataset, rows in normalize_page(self.release, task, data).items():
+                    batches[dataset] += [{**row, "batch": batch} for row in rows]
+                batches["pages"].append({"release": self.release, "section": task["section"], "kind": task["kind"],
+                                         "page": task["name"], "content_hash": digest, "written_at": written_at,
+                                         "batch": batch})
+        with timed(timer, "write"):
+            for dataset, rows in batches.items():
+                if not rows:
+                    continue
+                partition = os.path.join(self.directory, dataset, f"release={self.release}")
+                os.makedirs(partition, exist_ok=True)
+                table = pa.Table.from_pylist([{k: v for k, v in row.items() if k != "release"} for row in rows])
+                pq.write_table(table, os.path.join(partition, f"part-{batch}.parquet"))
+        if self.pages is not None:
+            self.pages.update((task["section"], task["kind"], task["name"]) for task, _, _, _ in pages)
+
+# Class to store each page once as a blob named by its content hash, with a per-release manifest pointing at the
+# blobs, so pages that are identical across releases or runs are only written once
+class BlobOutput(PageOutput):
+    batch_size = 200
+
+    def __init__(self, checkpoints, release, directory):
+        super().__init__(checkpoints, release)
+        self.directory = directory
+        self.manifest = open_blob_manifest(directory)
+
+    def has_page(self, task):
+        with self.lock:
+            row = self.manifest.execute(
+                "SELECT content_hash FROM entries WHERE release = ? AND section = ? AND kind = ? AND page = ?",
+                (self.release, task["section"], task["kind"], task["name"])).fetchone()
+        return row is not None and os.path.exists(blob_path(self.directory, row[0]))
+
+    def write_batch(self, pages, timer=None):
+        with timed(timer, "write"):
+            for _, data, digest, _ in pages:
+                path = blob_path(self.directory, digest)
+                if os.path.exists(path):
+                    count_event(timer, "blobs_reused")
+                    continue
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with gzip.open(temporary_path, "wt", encoding="utf-8") as file:
+                    json.dump(data, file, sort_keys=True, ensure_ascii=False)
+                os.replace(temporary_path, path)
+                count_event(timer, "blobs_written")
+            written_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            with self.manifest:
+                self.manifest.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)", [
+                    (self.release, task["section"], task["kind"], task["name"], digest,
+                     json.dumps(column_hashes(data), sort_keys=True), written_at)
+                    for task, data, digest, _ in pages
+                ])
+
+    def close(self, timer=None):
+        try:
+            super().close(timer)
+        finally:
+            self.manifest.close()
+
+# Function to open (and create) the release manifests of a blob store; a store that is only read must exist already
+def open_blob_manifest(directory, create=True):
+    if not create:
+        path = os.path.join(directory, "manifest.sqlite")
+        if not os.path.isfile(path):
+            raise ValueError(f"{directory} is not a blob store: it has no manifest.sqlite")
+        return sqlite3.connect(path, timeout=60, check_same_thread=False)
+    os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(os.path.join(directory, "manifest.sqlite"), timeout=60, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS entries (
+            release TEXT NOT NULL,
+            section TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            page TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            columns TEXT NOT NULL,
+            written_at TEXT NOT NULL,
+            PRIMARY KEY (release, section, kind, page)
+        )""")
+    connection.commit()
+    return connection
+
+# Function to get the path of the blob holding the page with a content hash
+def blob_path(directory, digest):
+    return os.path.join(directory, "blobs", digest[:2], f"{digest}.json.gz")
+
+# Function to hash each column row of a page, so column changes between releases show without reading blobs
+def column_hashes(data):
+    return {row[0]: content_hash(row)[:16] for row in data.get("columns", []) if row}
+
+# Function to read the page stored in a blob
+def read_blob(directory, digest):
+    with gzip.open(blob_path(directory, digest), "rt", encoding="utf-8") as file:
+        return json.load(file)
+
+# Function to compare two releases of a blob store from their manifests alone, given the store or the output
+# directory of the run that wrote it
+def diff_releases(directory, old_release, new_release):
+    if not os.path.isfile(os.path.join(directory, "manifest.sqlite")):
+        if os.path.isfile(os.path.join(store_path(directory, "blobs"), "manifest.sqlite")):
+            directory = store_path(directory, "blobs")
+    manifest = open_blob_manifest(directory, create=False)
+    try:
+        entries = {}
+        for release in (old_release, new_release):
+            entries[release] = {
+                (kind, page): (section, digest, json.loads(columns))
+                for section, kind, page, digest, columns in manifest.execute(
+                    "SELECT section, kind, page, content_hash, columns FROM entries WHERE release = ?", (release,))
+            }
+            if not entries[release]:
+                raise ValueError(f"Release {release} is not in the store at {directory}")
+    finally:
+        manifest.close()
+
+    old, new = entries[old_release], entries[new_release]
+    diff = {"added": [], "removed": [], "changed": [], "unchanged": 0}
+    for key in sorted(new.keys() - old.keys()):
+        diff["added"].append({"kind": key[0], "page": key[1], "section": new[key][0]})
+    for key in sorted(old.keys() - new.keys()):
+        diff["removed"].append({"kind": key[0], "page": key[1], "section": old[key][0]})
+    for key in sorted(old.keys() & new.keys()):
+        (_, old_hash, old_columns), (section, new_hash, new_columns) = old[key], new[key]
+        if old_hash == new_hash:
+            diff["unchanged"] += 1
+            continue
+        diff["changed"].append({
+            "kind": key[0], "page": key[1], "section": section,
+            "columns_added": sorted(new_columns.keys() - old_columns.keys()),
+            "columns_removed": sorted(old_columns.keys() - new_columns.keys()),
+            "columns_changed": sorted(name for name in old_columns.keys() & new_columns.keys()
+                                      if old_columns[name] != new_columns[name]),
+        })
+    return diff
+
+# Function to create the tables of the SQLite store
+def create_store_schema(connection):
+    for dataset, columns in STORE_DATASETS.items():
+        definitions = ", ".join(f'"{column}" INTEGER' if column == "position" else f'"{column}" TEXT' for column in columns)
+        connection.execute(f'CREATE TABLE IF NOT EXISTS "{dataset}" ({definitions})')
+        connection.execute(f'CREATE INDEX IF NOT EXISTS "{dataset}_page" ON "{dataset}" (release, section, kind, page)')
+    connection.commit()
+
+# Function to insert rows into a dataset of the SQLite store
+def insert_rows(connection, dataset, rows):
+    if rows:
+        columns = STORE_DATASETS[dataset]
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        connection.executemany(f'INSERT INTO "{dataset}" ({column_list}) VALUES ({placeholders})',
+                               [tuple(row.get(column) for column in columns) for row in rows])
+
+# Function to get the path of the consolidated store of an output format
+def store_path(base_path, output_format):
+    return os.path.join(base_path, {"sqlite": "hcm.sqlite", "parquet": "parquet", "blobs": "store"}[output_format])
+
+# Function to open the page output of a run in the current process
+def open_output(options):
+    checkpoints = CheckpointStore(options["checkpoint_path"])
+    if options["output_format"] == "sqlite":
+        output = SqliteOutput(checkpoints, options["release"], options["store_path"])
+    elif options["output_format"] == "parquet":
+        output = ParquetOutput(checkpoints, options["release"], options["store_path"])
+    elif options["output_format"] == "blobs":
+        output = BlobOutput(checkpoints, options["release"], options["store_path"])
+    else:
+        output = ExcelOutput(checkpoints, options["release"])
+    if options.get("search_path"):
+        output.search = SearchIndex(options["search_path"])
+    return output
+
+# Function to read a dataset of a consolidated store as a list of row dicts
+def read_dataset(path, dataset, release=None):
+    if os.path.isdir(path):
+        import pyarrow.dataset as ds
+
+        directory = os.path.join(path, dataset)
+        if not os.path.isdir(directory):
+            return []
+        rows = ds.dataset(directory, format="parquet", partitioning="hive").to_table().to_pylist()
+        if dataset != "pages":
+            # Pages rewritten by later runs are appended, so only keep the rows of each page's latest batch
+            latest = {}
+            for page in sorted(read_dataset(path, "pages", release), key=lambda page: page["batch"]):
+                latest[(page["release"], page["section"], page["kind"], page["page"])] = page["batch"]
+            rows = [row for row in rows
+                    if latest.get((row["release"], row["section"], row["kind"], row["page"])) == row["batch"]]
+        for row in rows:
+            row["release"] = str(row["release"])
+        return [row for row in rows if release is None or row["release"] == release]
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    try:
+        query = f'SELECT * FROM "{dataset}"' + (" WHERE release = ?" if release else "")
+        return [dict(row) for row in connection.execute(query, (release,) if release else ())]
+    finally:
+        connection.close()
+
+# Function to iterate over the pages of a SQLite/Parquet store or an Excel output directory
+# as (release, section, kind, page, data) tuples
+def iter_store_pages(path, release=None):
+    if os.path.isfile(os.path.join(path, "manifest.sqlite")):
+        manifest = open_blob_manifest(path, create=False)
+        try:
+            entries = manifest.execute(
+                "SELECT release, section, kind, page, content_hash FROM entries WHERE ? IS NULL OR release = ? "
+                "ORDER BY release, section, kind, page", (release, release)).fetchall()
+        finally:
+            manifest.close()
+        for page_release, section, kind, page, digest in entries:
+            yield page_release, section, kind, page, read_blob(path, digest)
+        return
+
+    if os.path.isfile(path) or any(os.path.isdir(os.path.join(path, dataset)) for dataset in STORE_DATASETS):
+        pages = defaultdict(lambda: defaultdict(list))
+        for dataset in DATASETS:
+            for row in read_dataset(path, dataset, release):
+                pages[(row["release"], row["section"], row["kind"], row["page"])][dataset].append(row)
+        for (page_release, section, kind, page), rows in sorted(pages.items()):
+            yield page_release, section, kind, page, denormalize_page(kind, rows)
+        return
+
+    manifests = sorted(name for name in os.listdir(path) if name.startswith("toc-manifest-") and name.endswith(".json"))
+    excel_release = release or (manifests[-1][len("toc-manifest-"):-len(".json")] if manifests else DEFAULT_RELEASE)
+    for section in sorted(os.listdir(path)):
+        for kind, folder in (("tables", "Tables"), ("views", "Views")):
+            directory = os.path.join(path, section, folder)
+            if not os.path.isdir(directory):
+                continue
+            for file_name in sorted(os.listdir(directory)):
+                if file_name.endswith(".xlsx"):
+                    data = read_excel_page(os.path.join(directory, file_name), kind)
+                    yield excel_release, section, kind, data["header"], data
+
+# Function to read a workbook written by save_to_excel back into page data
+def read_excel_page(file_path, kind):
+    import pandas as pd
+
+    sheets = pd.read_excel(file_path, sheet_name=None, dtype=str, keep_default_na=False)
+
+    # Helper function to get the rows and headers of a sheet
+    def sheet(name):
+        df = sheets.get(name)
+        return (df.values.tolist(), [str(column) for column in df.columns]) if df is not None else ([], [])
+
+    data = {"header": str(sheets["Header"].iloc[0, 0]), "details": [row[0] for row in sheet("Details")[0]]}
+    data["columns"], data["columns_headers"] = sheet("Columns")
+    if kind == "tables":
+        data["paragraph"] = ""  # Not kept in the workbooks
+        data["primary_key"] = sheet("Primary Key")[0]
+        data["indexes"], data["indexes_headers"] = sheet("Indexes")
+        data["foreign_keys"], data["foreign_keys_headers"] = sheet("Foreign Keys")
+    else:
+        data["query"], data["query_headers"] = sheet("Query")
+    return data
+
+# Function to export a consolidated store to one multi-sheet workbook per page
+def export_excel(path, output_dir, release=None):
+    count = 0
+    for page_release, section, kind, page, data in iter_store_pages(path, release):
+        save_dir = os.path.join(output_dir, page_release, section, "Tables" if kind == "tables" else "Views")
+        os.makedirs(save_dir, exist_ok=True)
+        save_to_excel(data, os.path.join(save_dir, f"{page.lower()}.xlsx"))
+        count += 1
+    print(f"Exported {count} pages from {path} to {output_dir}")
+
+# Function to build the queryable schema catalog (objects, columns, foreign keys, join graph components)
+# from a store or Excel output directory
+def build_catalog(source, catalog_path, release=None):
+    connection = sqlite3.connect(catalog_path)
+    connection.executescript("""
+        CREATE TABLE IF NOT EXISTS objects (release TEXT, name TEXT, kind TEXT, section TEXT, description TEXT,
+                                            PRIMARY KEY (release, name));
+        CREATE TABLE IF NOT EXISTS columns (release TEXT, object TEXT, name TEXT, position INTEGER, datatype TEXT);
+        CREATE INDEX IF NOT EXISTS columns_name ON columns (name, release);
+        CREATE INDEX IF NOT EXISTS columns_object ON columns (object, release);
+        CREATE TABLE IF NOT EXISTS foreign_keys (release TEXT, table_name TEXT, foreign_table TEXT, column_name TEXT,
+                                                 UNIQUE (release, table_name, foreign_table, column_name));
+        CREATE INDEX IF NOT EXISTS foreign_keys_table ON foreign_keys (table_name, release);
+        CREATE INDEX IF NOT EXISTS foreign_keys_foreign_table ON foreign_keys (foreign_table, release);
+        CREATE TABLE IF NOT EXISTS components (release TEXT, name TEXT, component TEXT, PRIMARY KEY (release, name));
+        CREATE TABLE IF NOT EXISTS join_paths (release TEXT, source TEXT, target TEXT, path TEXT,
+                                               PRIMARY KEY (release, source, target));
+    """)
+    releases, counts = set(), Counter()
+    with connection:
+        for page_release, section, kind, page, data in iter_store_pages(source, release):
+            if page_release not in releases:
+                releases.add(page_release)
+                for table in ("objects", "columns", "foreign_keys", "components", "join_paths"):
+                    connection.execute(f"DELETE FROM {table} WHERE release = ?", (page_release,))
+            name = page.upper()
+            connection.execute("INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?)",
+                               (page_release, name, kind, section, data.get("paragraph") or data["header"]))
+            headers = data.get("columns_headers", [])
+            connection.executemany("INSERT INTO columns VALUES (?, ?, ?, ?, ?)", [
+                (page_release, name, row[0].upper(), position, header_cell(row, headers, "Datatype", 1))
+                for position, row in enumerate(data.get("columns", [])) if row
+            ])
+            headers = data.get("foreign_keys_headers", [])
+            connection.executemany("INSERT OR IGNORE INTO foreign_keys VALUES (?, ?, ?, ?)", [
+                (page_release, (header_cell(row, headers, "Table", 0) or name).upper(),
+                 (header_cell(row, headers, "Foreign Table", 1) or "").upper(),
+                 (header_cell(row, headers, "Foreign Key Column", 2) or "").upper())
+                for row in data.get("foreign_keys", []) if len(row) >= 2
+            ])
+            counts[kind] += 1
+
+        # Precompute the connected components of the join graph so unrelated tables are answered without a search
+        for page_release in releases:
+            graph = SchemaCatalog.load_graph(connection, page_release)
+            components = {}
+            for start in graph:
+                if start in components:
+                    continue
+                components[start] = start
+                pending = [start]
+                while pending:
+                    for neighbor, _ in graph[pending.pop()]:
+                        if neighbor not in components:
+                            components[neighbor] = start
+                            pending.append(neighbor)
+            connection.executemany("INSERT INTO components VALUES (?, ?, ?)",
+                                   [(page_release, name, component) for name, component in components.items()])
+    connection.close()
+    print(f"Catalogued {counts['tables']} tables and {counts['views']} views of release(s) "
+          f"{', '.join(sorted(releases)) or 'none'} from {source} into {catalog_path}")
+
+# Class to answer column, foreign key neighbour and join path questions from the schema catalog
+class SchemaCatalog:
+    def __init__(self, path, release=None):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No catalog at {path}; build it with: script.py catalog build <store>")
+        self.connection = sqlite3.connect(path)
+        self.release = release or self.connection.execute("SELECT MAX(release) FROM objects").fetchone()[0]
+        self.graph = None
+
+    # Function to load the foreign keys of a release as an undirected adjacency list
+    @staticmethod
+    def load_graph(connection, release):
+        graph = defaultdict(list)
+        for table_name, foreign_table, column_name in connection.execute(
+                "SELECT table_name, foreign_table, column_name FROM foreign_keys WHERE release = ?", (release,)):
+            if table_name and foreign_table and table_name != foreign_table:
+                graph[table_name].append((foreign_table, column_name))
+                graph[foreign_table].append((table_name, column_name))
+        return graph
+
+    # Function to find the tables and views that have a column
+    def tables_with_column(self, column):
+        return self.connection.execute("""
+            SELECT columns.object, objects.kind, objects.section, columns.datatype
+            FROM columns LEFT JOIN objects ON objects.release = columns.release AND objects.name = columns.object
+            WHERE columns.name = ? AND columns.release = ? ORDER BY columns.object""",
+            (column.upper(), self.release)).fetchall()
+
+    # Function to list the tables a table references or is referenced by, with the joining column
+    def neighbors(self, table):
+        table = table.upper()
+        return self.connection.execute("""
+            SELECT foreign_table, column_name, 'references' FROM foreign_keys WHERE table_name = ? AND release = ?
+            UNION
+            SELECT table_name, column_name, 'referenced by' FROM foreign_keys WHERE foreign_table = ? AND release = ?
+            ORDER BY 1""", (table, self.release, table, self.release)).fetchall()
+
+    # Function to find a shortest foreign key join path between two tables, caching every answer
+    def join_path(self, source, target):
+        source, target = source.upper(), target.upper()
+        cached = self.connection.execute("SELECT path FROM join_paths WHERE release = ? AND source = ? AND target = ?",
+                                         (self.release, source, target)).fetchone()
+        if cached:
+            return json.loads(cached[0])
+        path = self.search_path(source, target)
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO join_paths VALUES (?, ?, ?, ?)",
+                                    (self.release, source, target, json.dumps(path)))
+            if path is not None:
+                reverse = [{"from": step["to"], "to": step["from"], "column": step["column"]} for step in reversed(path)]
+                self.connection.execute("INSERT OR REPLACE INTO join_paths VALUES (?, ?, ?, ?)",
+                                        (self.release, target, source, json.dumps(reverse)))
+        return path
+
+    # Function to search the join graph breadth first for a shortest path
+    def search_path(self, source, target):
+        if source == target:
+            return []
+        components = dict(self.connection.execute(
+            "SELECT name, component FROM components WHERE release = ? AND name IN (?, ?)", (self.release, source, target)))
+        if components.get(source) is None or components.get(source) != components.get(target):
+            return None  # Not connected by any chain of foreign keys
+        if self.graph is None:
+            self.graph = self.load_graph(self.connection, self.release)
+        previous = {source: None}
+        frontier = [source]
+        while frontier and target not in previous:
+            next_frontier = []
+            for table in frontier:
+                for neighbor, column in self.graph[table]:
+                    if neighbor not in previous:
+                        previous[neighbor] = (table, column)
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        path, table = [], target
+        while previous[table] is not None:
+            parent, column = previous[table]
+            path.append({"from": parent, "to": table, "column": column})
+            table = parent
+        return list(reversed(path))
+
+    def close(self):
+        self.connection.close()
+
+# Class to keep a full-text (SQLite FTS5) index of page names, descriptions, details, columns and view queries
+class SearchIndex:
+    # Relative BM25 weights of the indexed fields: name, description, details, columns, query
+    weights = (10.0, 4.0, 2.0, 1.0, 1.0)
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        try:
+            self.connection.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5 (
+                    release UNINDEXED, section UNINDEXED, kind UNINDEXED, page UNINDEXED,
+                    name, description, details, columns, query, tokenize = 'unicode61');
+                CREATE TABLE IF NOT EXISTS indexed (
+                    release TEXT NOT NULL, section TEXT NOT NULL, kind TEXT NOT NULL, page TEXT NOT NULL,
+                    content_hash TEXT, doc_id INTEGER, PRIMARY KEY (release, section, kind, page));
+            """)
+        except sqlite3.OperationalError as e:
+            self.connection.close()
+            raise RuntimeError(f"SQLite was built without FTS5, so the search index is unavailable: {e}")
+
+    # Function to index pages given as (release, section, kind, page, data, content hash), skipping unchanged pages
+    def update(self, pages):
+        updated = 0
+        with self.lock, self.connection:
+            for release, section, kind, page, data, digest in pages:
+                key = (release, section, kind, page)
+                previous = self.connection.execute(
+                    "SELECT content_hash, doc_id FROM indexed WHERE release = ? AND section = ? AND kind = ? AND page = ?",
+                    key).fetchone()
+                if previous is not None and previous[0] == digest:
+                    continue
+                if previous is not None:
+                    self.connection.execute("DELETE FROM documents WHERE rowid = ?", (previous[1],))
+                cursor = self.connection.execute("INSERT INTO documents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", key + (
+                    f"{page} {data['header']}",
+                    data.get("paragraph", ""),
+                    "\n".join(data.get("details", [])),
+                    "\n".join(" ".join(str(cell) for cell in row if cell) for row in data.get("columns", [])),
+                    "\n".join(" ".join(str(cell) for cell in row if cell) for row in data.get("query", [])),
+                ))
+                self.connection.execute("INSERT OR REPLACE INTO indexed VALUES (?, ?, ?, ?, ?, ?)",
+                                        key + (digest, cursor.lastrowid))
+                updated += 1
+        return updated
+
+    # Function to run a ranked (BM25) query, optionally filtered by release, section and kind
+    def search(self, query, release=None, section=None, kind=None, limit=20):
+        filters, parameters = [], [query]
+        for column, value in (("release", release), ("section", section), ("kind", kind)):
+            if value:
+                filters.append(f"AND {column} = ?")
+                parameters.append(value)
+        with self.lock:
+            return self.connection.execute(f"""
+                SELECT release, section, kind, page, bm25(documents, 0, 0, 0, 0, {", ".join(map(str, self.weights))}),
+                       snippet(documents, -1, '[', ']', '...', 12)
+                FROM documents WHERE documents MATCH ? {" ".join(filters)}
+                ORDER BY 5 LIMIT ?""", parameters + [limit]).fetchall()
+
+    def close(self):
+        self.connection.close()
+
+# Function to ask the server whether a page changed since its checkpoint, without loading it in the browser
+def check_page_unchanged(task, checkpoint=None):
+    headers = conditional_headers(checkpoint["etag"], checkpoint["last_modified"]) if checkpoint else {}
+    try:
+        throttle(task["url"])
+        response = get_http_session().head(task["url"], headers=headers, timeout=30, allow_redirects=True)
+    except Exception:
+        return False, {}
+    return bool(headers) and response.status_code == 304, response_validators(response)
+
+# Thread-local storage so every HTTP worker thread keeps its own keep-alive session
+http_local = threading.local()
+
+# Function to get the pooled, keep-alive HTTP session of the current thread
+def get_http_session(pool_size=HTTP_WORKERS):
+    session = getattr(http_local, "session", None)
+    if session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        http_local.session = session
+    return session
+
+# Function to fetch a documentation page over HTTP
+def fetch_page(url, timeout=30):
+    response = get_http_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+# Function to read the HTTP validators of a response for later conditional requests
+def response_validators(response):
+    return {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+
+# Function to turn stored validators into conditional request headers
+def conditional_headers(etag=None, last_modified=None):
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+# Function to parse the static table of contents into the tables and views pages of each section
+def parse_toc(content, base_url=BASE_URL):
+    from lxml import html as lxml_html
+
+    tree = lxml_html.fromstring(content)
+    sections = []
+    for section_item in tree.xpath("//li[a]"):
+        match = re.match(r"^(\d+)\s+(.+)$", element_text(section_item.xpath("./a")[0]))
+        if not match:
+            continue
+        section = {"name": f"{match.group(1)}-{'-'.join(match.group(2).split())}", "tables": [], "views": []}
+        for group_item in section_item.xpath("./ul/li[a]"):
+            kind = element_text(group_item.xpath("./a")[0]).lower()
+            if kind not in ("tables", "views"):
+                continue
+            for page_link in group_item.xpath("./ul//li/a[@href]"):
+                page_url = urldefrag(urljoin(base_url, page_link.get("href")))[0]
+                section[kind].append({"name": element_text(page_link), "url": page_url})
+        if section["tables"] or section["views"]:
+            sections.append(section)
+    return sections
+
+# Function to get the path of the cached TOC manifest of a release
+def manifest_path(cache_dir, release):
+    return os.path.join(cache_dir, f"toc-manifest-{release}.json")
+
+# Function to build a versioned manifest of every section, group and page from the table of contents, refusing a
+# table of contents whose markup yields no pages rather than running, and caching, an empty manifest
+def build_manifest(toc_content, validators, release=DEFAULT_RELEASE, base_url=BASE_URL):
+    sections = parse_toc(toc_content, base_url)
+    if not sections:
+        raise ValueError(f"No sections with table or view pages were found in the table of contents at {base_url}; "
+                         f"its markup may have changed")
+    return {
+        "version": MANIFEST_VERSION,
+        "release": release,
+        "base_url": base_url,
+        "toc_hash": hashlib.sha256(toc_content).hexdigest(),
+        "toc_etag": validators["etag"],
+        "toc_last_modified": validators["last_modified"],
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "sections": sections,
+    }
+
+# Function to write a manifest atomically so an interrupted run never leaves a truncated file
+def save_manifest(manifest, path):
+    write_atomically(path, json.dumps(manifest, indent=1))
+
+# Function to load the cached TOC manifest, rebuilding it only when the table of contents has changed
+def load_manifest(cache_dir, release=DEFAULT_RELEASE, base_url=None, refresh=False, check_toc=True):
+    base_url = base_url or release_base_url(release)
+    path = manifest_path(cache_dir, release)
+    cached = None
+    if not refresh and os.path.exists(path):
+        with open(path) as file:
+            cached = json.load(file)
+        if cached.get("version") != MANIFEST_VERSION or cached.get("base_url") != base_url or not cached.get("sections"):
+            cached = None  # Written by an older layout, for another documentation root, or empty
+    if cached and not check_toc:
+        return cached
+
+    headers = conditional_headers(cached["toc_etag"], cached["toc_last_modified"]) if cached else {}
+    try:
+        response = get_http_session().get(urljoin(base_url, "toc.htm"), headers=headers, timeout=30)
+        if cached and response.status_code == 304:
+            print(f"Table of contents unchanged, using cached manifest {path}")
+            return cached
+        response.raise_for_status()
     except Exception as e:
-        print(f"Error processing section {section_title}: {e}")
+        if cached:
+            print(f"Could not check the table of contents ({e}), using cached manifest {path}")
+            return cached
+        raise
+    if cached and hashlib.sha256(response.content).hexdigest() == cached["toc_hash"]:
+        print(f"Table of contents unchanged, using cached manifest {path}")
+        return cached
+
+    print(f"Discovering sections and pages from the table of contents of release {release}...")
+    manifest = build_manifest(response.content, response_validators(response), release, base_url)
+    save_manifest(manifest, path)
+    page_count = sum(len(section["tables"]) + len(section["views"]) for section in manifest["sections"])
+    print(f"Wrote manifest with {len(manifest['sections'])} sections and {page_count} pages to {path}")
+    return manifest
+
+# Function to pick the manifest sections to process, by full name (11-Global-Payroll) or number (11)
+def select_sections(manifest, section_names=None):
+    if not section_names:
+        return manifest["sections"]
+    wanted = set(section_names)
+    selected = [section for section in manifest["sections"]
+                if section["name"] in wanted or section["name"].split("-", 1)[0] in wanted]
+    if not selected:
+        raise ValueError(f"None of the sections {', '.join(section_names)} are in the manifest")
+    return selected
+
+# Function to fetch, parse and save a single page over HTTP, skipping it when the server reports it unchanged;
+# quiet leaves out the progress lines
+def process_page_http(task, output, full=False, quiet=False):
+    page_name, section_name = task["name"], task["section"]
+    timer = StageTimer(threading.current_thread().name)
+    timer.page = f"{section_name}/{task['kind']}/{page_name}"
+    try:
+        checkpoint = None if full else output.checkpoints.get(output.release, task)
+        if not checkpoint_is_current(checkpoint, task, output):
+            checkpoint = None
+        headers = conditional_headers(checkpoint["etag"], checkpoint["last_modified"]) if checkpoint else {}
+        with timer.stage("fetch"):
+            throttle(task["url"])
+            response = get_http_session().get(task["url"], headers=headers, timeout=30)
+        if checkpoint and response.status_code == 304:
+            if not quiet:
+                print(f"Skipping unchanged page: {page_name} in section: {section_name}")
+            timer.count("not_modified")
+            return "unchanged", timer.drain()
+        response.raise_for_status()
+        if not quiet:
+            print(f"Fetched page: {page_name} in section: {section_name}")
+        with timer.stage("extract"):
+            data = PAGE_PARSERS[task["kind"]](response.content)
+        status = save_page(task, data, output, checkpoint, response_validators(response), timer)
+        return status, timer.drain()
+    except Exception as e:
+        print(f"Error processing page {page_name} in section {section_name}: {e}")
+        timer.count("page_errors")
+        output.checkpoints.mark_failed(output.release, task, str(e))
+        return "failed", timer.drain()
+
+# Function to process page tasks over plain HTTP with a thread pool instead of browsers
+def process_sections_with_http(tasks, options, metrics, workers=HTTP_WORKERS):
+    print(f"Fetching {len(tasks)} pages with {workers} HTTP workers...")
+    set_rate_limiters(options["rate_limiters"])
+    result_queue = queue.Queue()
+    write_queue, writers = start_writers(options, result_queue, use_processes=False)
+    output = QueuedOutput(open_output(options), write_queue)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, initializer=get_http_session, initargs=(workers,)) as executor:
+            futures = {executor.submit(process_page_http, task, output, options["full"], options["quiet"]): task
+                       for task in tasks}
+            for future in as_completed(futures):
+                status, events = future.result()
+                metrics.merge(events)
+                if status == "written":
+                    metrics.page_handed(futures[future])  # Counted as written once a writer saved it
+                else:
+                    metrics.page_done(status)
+                drain_results(result_queue, metrics, timeout=0)
     finally:
-        driver.quit()  # Ensure the browser is closed after processing
-
-# Function to process sections using a pool of processes in order
-def process_sections_with_pool(sections, directories, pool_size=5):
-    treeview_mapping = {
-        "2-AI": ("treeview4_0", "treeview4_1"),
-        "3-Absence-Management": ("treeview6_0", "treeview6_1"),
-        "4-Benefits": ("treeview8_0", "treeview8_1"),
-        "5-Career-Development": ("treeview10_0", "treeview10_1"),
-        "6-Celebrate": ("treeview12_0", "treeview12_1"),
-        "7-Compensation": ("treeview14_0", "treeview14_1"),
-        "8-Corporate-Social-Responsibility": ("treeview16_0", "treeview16_1"),
-        "9-Fast-Formula": ("treeview18_0", "treeview18_1"),
-        "10-Global-Human-Resources": ("treeview20_0", "treeview20_1"),
-        "11-Global-Payroll": ("treeview22_0", "treeview22_1"),
-        "12-Global-Payroll-Interface": ("treeview24_0", "treeview24_1"),
-        "13-Goal-Management": ("treeview26_0", "treeview26_1"),
-        "14-HCM-Common": ("treeview28_0", "treeview28_1"),
-        "15-HCM-Communicate": (None, "treeview30_0"),
-        "16-HCM-Configuration-Workbench": ("treeview32_0", None),
-        "17-HCM-Country-and-Vertical-Extensions": (None, "treeview34_0"),
-        "18-HCM-Extracts": ("treeview36_0", None),
-        "19-Performance-Management": ("treeview38_0", "treeview38_1"),
-        "20-Profile-Management": ("treeview40_0", "treeview40_1"),
-        "21-Questionnaire": ("treeview42_0", "treeview42_1"),
-        "22-Recruiting": ("treeview44_0", "treeview44_1"),
-        "23-Social-Connection": ("treeview46_0", None),
-        "24-Succession-Management": ("treeview48_0", "treeview48_1"),
-        "25-Talent-Review": ("treeview50_0", "treeview50_1"),
-        "26-Time-and-Labor": ("treeview52_0", "treeview52_1"),
-        "27-Touchpoints": ("treeview54_0", "treeview54_1"),
-        "28-Work-Life": ("treeview56_0", "treeview56_1"),
-        "29-Workforce-Directory-Management": ("treeview58_0", "treeview58_1"),
-        "30-Workforce-Health-and-Safety-Incidents": ("treeview60_0", "treeview60_1"),
-        "31-Workforce-Management": ("treeview62_0", "treeview62_1"),
-        "32-Workforce-Modeling": ("treeview64_0", "treeview64_1"),
-        "33-Workforce-Predictions": ("treeview66_0", "treeview66_1"),
-        "34-Workforce-Reputation-Management": ("treeview68_0", "treeview68_1"),
-        "35-Workforce-Scheduling": ("treeview70_0", "treeview70_1"),
+        stop_writers(write_queue, writers)
+        output.close()
+    drain_results(result_queue, metrics)
+    metrics.settle_writes()
+
+# Class of one column of a table or view page
+@dataclass
+class Column:
+    __slots__ = ("name", "datatype", "length", "precision", "not_null", "comments")
+    name: str
+    datatype: str
+    length: str
+    precision: str
+    not_null: bool
+    comments: str
+
+# Class of one index of a table page
+@dataclass
+class Index:
+    __slots__ = ("name", "uniqueness", "columns")
+    name: str
+    uniqueness: str
+    columns: str
+
+# Class of one foreign key of a table page
+@dataclass
+class ForeignKey:
+    __slots__ = ("table", "foreign_table", "column")
+    table: str
+    foreign_table: str
+    column: str
+
+# Class of an extracted table page
+@dataclass
+class TablePage:
+    __slots__ = ("release", "section", "name", "description", "details", "primary_key", "columns", "indexes",
+                 "foreign_keys")
+    release: str
+    section: str
+    name: str
+    description: str
+    details: tuple
+    primary_key: tuple
+    columns: tuple
+    indexes: tuple
+    foreign_keys: tuple
+
+# Class of an extracted view page
+@dataclass
+class ViewPage:
+    __slots__ = ("release", "section", "name", "details", "columns", "query")
+    release: str
+    section: str
+    name: str
+    details: tuple
+    columns: tuple
+    query: str
+
+# Function to turn the extracted data of a page into its typed record
+def page_record(release, task, data):
+    headers = data.get("columns_headers", [])
+    columns = tuple(Column(row[0], header_cell(row, headers, "Datatype", len(row)),
+                           header_cell(row, headers, "Length", len(row)),
+                           header_cell(row, headers, "Precision", len(row)),
+                           header_cell(row, headers, "Not-null", len(row)) == "Yes",
+                           header_cell(row, headers, "Comments", len(row)))
+                    for row in data["columns"] if row)
+    if task["kind"] == "views":
+        return ViewPage(release, task["section"], data["header"], tuple(data["details"]), columns,
+                        "\n".join(row[0] for row in data["query"] if row))
+    headers = data.get("indexes_headers", [])
+    indexes = tuple(Index(row[0], header_cell(row, headers, "Uniqueness", 1), header_cell(row, headers, "Columns", 3))
+                    for row in data["indexes"] if row)
+    headers = data.get("foreign_keys_headers", [])
+    foreign_keys = tuple(ForeignKey(header_cell(row, headers, "Table", 0), header_cell(row, headers, "Foreign Table", 1),
+                                    header_cell(row, headers, "Foreign Key Column", 2))
+                         for row in data["foreign_keys"] if len(row) >= 2)
+    return TablePage(release, task["section"], data["header"], data["paragraph"], tuple(data["details"]),
+                     tuple(column.strip() for _, columns in data["primary_key"] for column in columns.split(",")),
+                     columns, indexes, foreign_keys)
+
+# Function to stream typed table and view records as they are extracted, without prompting or writing any files.
+# At most buffer_size extracted pages wait for the consumer, so memory stays bounded whatever the corpus size.
+def iter_pages(release=DEFAULT_RELEASE, sections=None, kinds=("tables", "views"), engine="http", workers=None,
+               base_url=None, profile="default", max_rate=None, buffer_size=16):
+    base_url = (base_url or release_base_url(release)).rstrip("/") + "/"
+    response = get_http_session().get(urljoin(base_url, "toc.htm"), timeout=30)
+    response.raise_for_status()
+    manifest = build_manifest(response.content, response_validators(response), release, base_url)
+    selected = select_sections(manifest, sections)
+    directories = {section["name"]: {"tables": None, "views": None} for section in selected}
+    tasks = [task for task in build_page_tasks(selected, directories) if task["kind"] in kinds]
+    options = {
+        "base_url": base_url,
+        "compare": False,
+        "release": release,
+        "checkpoint_path": ":memory:",  # Every page is extracted, and nothing is kept between runs
+        "full": True,
+        "output_format": "excel",  # Never written: extracted pages only go onto the stream
+        "store_path": None,
+        "write_queue_size": buffer_size,
+        "profile": profile,
+        "driver_path": resolve_chromedriver() if engine != "http" else None,
+        "driver_cache": None,
+        "page_deadline": 240,
+        "recycle_pages": 200,
+        "recycle_mb": 1500,
+        "search_path": None,
+        "quiet": True,  # A library caller gets the pages, not a line per page
+        "rate_limiters": {host: HostRateLimiter(max_rate) for host in {urlsplit(task["url"]).netloc for task in tasks}}
+                         if max_rate else {},
     }
+    if engine == "http":
+        stream = stream_pages_with_http(tasks, options, workers or HTTP_WORKERS)
+    else:
+        stream = stream_pages_with_browsers(tasks, options, workers or 4)
+    try:
+        for task, data, _, _ in stream:
+            yield page_record(release, task, data)
+    finally:
+        stream.close()  # Stop extracting when the consumer stops early
 
-    with Pool(processes=pool_size) as pool:
-        pool.map(process_section, [
-            (
-                section_name,
-                treeview_mapping[section_name][0] if create_tables else None,
-                treeview_mapping[section_name][1] if create_views else None,
-                directories[section_name]["tables"],
-                directories[section_name]["views"]
-            )
-            for section_name, create_tables, create_views in sections
-        ])
+# Function to yield extracted pages from a thread pool of HTTP fetches, cancelling the rest when the consumer stops
+def stream_pages_with_http(tasks, options, workers):
+    set_rate_limiters(options["rate_limiters"])
+    write_queue = queue.Queue(maxsize=options["write_queue_size"])
+    output = QueuedOutput(open_output(options), write_queue)
+    executor = ThreadPoolExecutor(max_workers=workers, initializer=get_http_session, initargs=(workers,))
+
+    failed = []
+
+    # Helper function to mark the end of the stream once every page has been processed or cancelled
+    def fetch_all():
+        try:
+            futures = {executor.submit(process_page_http, task, output, options["full"], options["quiet"]): task
+                       for task in tasks}
+            for future, task in futures.items():
+                try:
+                    if future.result()[0] == "failed":
+                        failed.append(task)
+                except CancelledError:
+                    pass  # The consumer stopped before this page was started
+        finally:
+            write_queue.put(None)
+
+    threading.Thread(target=fetch_all, name="stream", daemon=True).start()
+    finished = False
+    try:
+        while True:
+            item = write_queue.get()
+            if item is None:
+                finished = True
+                break
+            yield item
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        while not finished:
+            finished = write_queue.get() is None  # Unblock the pages still in flight
+        output.close()
+    raise_failed_pages(failed)
+
+# Function to yield extracted pages from a pool of supervised browsers, so pages of crashed or hung browsers are
+# requeued as in a batch run, stopping the browsers when the consumer stops
+def stream_pages_with_browsers(tasks, options, workers):
+    task_queue, result_queue, write_queue = Queue(), Queue(), Queue(maxsize=options["write_queue_size"])
+    supervisor = BrowserSupervisor(task_queue, result_queue, write_queue, [], options, options["page_deadline"])
+    for task in order_tasks_by_section_size(tasks):
+        task_queue.put(task)
+    for _ in range(max(1, min(workers, len(tasks)))):
+        supervisor.start_worker()
+    checkpoints = CheckpointStore(options["checkpoint_path"])
+    metrics = RunMetrics()  # Only needed by the supervisor; the stream has no run report
+    remaining, finished, written, yielded, failed = len(tasks), set(), set(), set(), []
+
+    # Helper function to take in every report that is already waiting
+    def drain():
+        nonlocal remaining
+        while True:
+            try:
+                worker_id, task, status, events = result_queue.get_nowait()
+            except queue.Empty:
+                return
+            supervisor.record(worker_id, task, status)
+            page = task and f"{task['section']}/{task['kind']}/{task['name']}"
+            if task is not None and status not in ("started", "requeued") and page not in finished:
+                finished.add(page)
+                remaining -= 1
+                if status == "written":
+                    written.add(page)
+                elif status == "failed":
+                    failed.append(task)
+
+    try:
+        # A page goes onto the write queue before its report, so keep reading until every written page was yielded
+        while remaining > 0 or not written <= yielded:
+            try:
+                item = write_queue.get(timeout=0.1)
+            except queue.Empty:
+                item = None
+            drain()
+            if item is not None:
+                page = f"{item[0]['section']}/{item[0]['kind']}/{item[0]['name']}"
+                if page not in yielded:  # A page extracted again after its worker was killed is only yielded once
+                    yielded.add(page)
+                    yield item
+            for task in supervisor.check(checkpoints, metrics, drain):
+                page = f"{task['section']}/{task['kind']}/{task['name']}"
+                if page not in finished:
+                    finished.add(page)
+                    failed.append(task)
+                    remaining -= 1
+            if item is None and not supervisor.any_alive():
+                print(f"All browser workers exited with {remaining} pages left.")
+                failed.extend(task for task in tasks
+                              if f"{task['section']}/{task['kind']}/{task['name']}" not in finished)
+                break
+    finally:
+        supervisor.stop(metrics, timeout=10, discard_pages=True)  # A consumer that stopped early needs no more pages
+        checkpoints.close()
+    raise_failed_pages(failed)
+
+# Function to end a stream with an error naming the pages it could not extract, once every other page was yielded
+def raise_failed_pages(failed):
+    if failed:
+        pages = ", ".join(f"{task['section']}/{task['kind']}/{task['name']}" for task in failed)
+        raise RuntimeError(f"{len(failed)} pages could not be extracted: {pages}")
 
 # Main function to extract data for all sections using a process pool
-def extract_data_with_pool():
+def extract_data_with_pool(engine="selenium", output=None, workers=None, base_url=None, compare=False,
+                           release=DEFAULT_RELEASE, section_names=None, refresh_manifest=False, check_toc=True, full=False,
+                           report_path=None, prometheus_path=None, output_format="excel", writers=1, write_queue_size=64,
+                           adaptive=False, min_workers=2, max_workers=None, max_rate=None,
+                           profile="default", search_index=True, page_deadline=240, recycle_pages=200,
+                           recycle_mb=1500, refresh_driver=False):
     # Get the base path from the user
     global base_path
-    base_path = get_save_path()
+    base_path = output or get_save_path()
+    base_url = (base_url or release_base_url(release)).rstrip("/") + "/"
+
+    metrics = RunMetrics(prometheus_path)
+    timer = StageTimer("main")
+    options = {
+        "base_url": base_url,
+        "compare": compare,
+        "release": release,
+        "checkpoint_path": os.path.join(base_path, "checkpoints.sqlite"),
+        "full": full,
+        "output_format": output_format,
+        "store_path": store_path(base_path, output_format) if output_format != "excel" else None,
+        "writers": writers,
+        "write_queue_size": write_queue_size,
+        "profile": profile,
+        "driver_path": None,
+        "driver_cache": base_path,
+        "page_deadline": page_deadline,
+        "recycle_pages": recycle_pages,
+        "recycle_mb": recycle_mb,
+        "search_path": os.path.join(base_path, "search.sqlite") if search_index else None,
+        "quiet": False,
+        "rate_limiters": {urlsplit(base_url).netloc: HostRateLimiter(max_rate)} if max_rate else {},
+    }
+    os.makedirs(base_path, exist_ok=True)
+    open_output(options).close()  # Create the schemas before the workers share them
+
+    # Start the browsers while the table of contents is checked, so they are warm once the pages are known
+    supervisor, controller = None, None
+    if engine != "http":
+        with timer.stage("driver_resolve"):
+            options["driver_path"] = resolve_chromedriver(base_path, refresh=refresh_driver)
+        controller = ConcurrencyController(min_workers, max_workers or 15, initial=workers or min_workers) \
+            if adaptive else None
+        supervisor = start_browser_pool(options, controller.target if controller else workers or 15)
+
+    try:
+        # Load the TOC manifest, discovering sections and pages only when the TOC has changed
+        with timer.stage("manifest"):
+            manifest = load_manifest(base_path, release, base_url, refresh=refresh_manifest, check_toc=check_toc)
+        metrics.merge(timer.drain())
+        sections = select_sections(manifest, section_names)
+
+        # Create save directories dynamically for all sections when saving one workbook per page
+        directories = {}
+        for section in sections:
+            if output_format == "excel":
+                tables_dir, views_dir = create_save_directories(base_path, section["name"], bool(section["tables"]), bool(section["views"]))
+            else:
+                tables_dir, views_dir = None, None
+            directories[section["name"]] = {"tables": tables_dir, "views": views_dir}
+
+        # Process all pages, skipping those that are checkpointed and unchanged
+        tasks = build_page_tasks(sections, directories)
+    except BaseException:
+        if supervisor:
+            supervisor.stop(metrics)  # Stop the browsers started for pages that will not come
+            stop_writers(supervisor.write_queue, supervisor.writers)
+        raise
+    print(f"Processing {len(tasks)} pages in {len(sections)} sections...")
+    if engine == "http":
+        process_sections_with_http(tasks, options, metrics, workers=workers or HTTP_WORKERS)
+    else:
+        process_pages_with_browser_pool(tasks, options, metrics, pool_size=workers or 15, controller=controller,
+                                        supervisor=supervisor)
+    report = metrics.write_report(report_path or os.path.join(base_path, "run-report.json"), engine=engine)
+    statuses = metrics.statuses
+    first_page = report["startup"]["time_to_first_page_seconds"]
+    print(f"Data extraction completed for all sections: {statuses['written']} written, "
+          f"{statuses['unchanged']} unchanged, {statuses['failed']} failed "
+          f"({report['pages_per_second']:.2f} pages/sec"
+          f"{f', first page after {first_page:.1f}s' if first_page is not None else ''}).")
+
+# Function to get the id of a page task in a shared work queue
+def queue_task_id(task):
+    return f'{task["release"]}/{task["section"]}/{task["kind"]}/{task["name"]}'
+
+# Class of the lease and retry rules shared by the work queue backends
+class WorkQueue:
+    def __init__(self, job="oracle-hcm", visibility_timeout=300, max_attempts=3):
+        self.job = job
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+    # Function to wait until no page is queued or leased, printing the progress
+    def wait(self, interval=10):
+        while True:
+            counts = self.counts()
+            print(f"{counts['done']} done, {counts['failed']} failed, {counts['leased']} leased, "
+                  f"{counts['queued']} queued of {counts['total']} pages")
+            if not counts["queued"] and not counts["leased"]:
+                return counts
+            time.sleep(interval)
+
+# Class to share page tasks between nodes through one SQLite database on a shared filesystem
+class SqliteWorkQueue(WorkQueue):
+    def __init__(self, path, job="oracle-hcm", visibility_timeout=300, max_attempts=3):
+        super().__init__(job, visibility_timeout, max_attempts)
+        self.lock = threading.Lock()
+        # The default rollback journal, since WAL does not work across hosts on a network filesystem
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                job TEXT NOT NULL,
+                id TEXT NOT NULL,
+                task TEXT NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                visible_at REAL NOT NULL,
+                lease_token TEXT,
+                leased_by TEXT,
+                completed_by TEXT,
+                content_hash TEXT,
+                error TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (job, id)
+            )""")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS tasks_visible ON tasks (job, state, visible_at)")
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")  # Takes the write lock, so two nodes never lease the same page
+            try:
+                yield self.connection
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+    # Function to add page tasks that are not in the job yet, optionally queueing failed ones again
+    def publish(self, tasks, retry_failed=False):
+        now, updated_at = time.time(), time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        with self.transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO tasks (job, id, task, state, visible_at, updated_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+                [(self.job, queue_task_id(task), json.dumps(task), now, updated_at) for task in tasks])
+            added = connection.total_changes - before
+            if retry_failed:
+                connection.execute("UPDATE tasks SET state = 'queued', attempts = 0, visible_at = ?, updated_at = ? "
+                                   "WHERE job = ? AND state = 'failed'", (now, updated_at, self.job))
+        return added
+
+    # Function to lease up to count pages that are queued or whose lease expired, failing pages out of attempts
+    def lease(self, worker, count):
+        now, updated_at = time.time(), time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        leases = []
+        with self.transaction() as connection:
+            rows = connection.execute(
+                "SELECT id, task, attempts FROM tasks WHERE job = ? AND state IN ('queued', 'leased') AND visible_at <= ? "
+                "ORDER BY visible_at LIMIT ?", (self.job, now, count)).fetchall()
+            for task_id, task, attempts in rows:
+                if attempts >= self.max_attempts:
+                    connection.execute(
+                        "UPDATE tasks SET state = 'failed', lease_token = NULL, error = ?, updated_at = ? "
+                        "WHERE job = ? AND id = ?", (f"Lease expired after {attempts} attempts", updated_at, self.job, task_id))
+                    continue
+                token = uuid.uuid4().hex
+                connection.execute(
+                    "UPDATE tasks SET state = 'leased', attempts = attempts + 1, visible_at = ?, lease_token = ?, "
+                    "leased_by = ?, updated_at = ? WHERE job = ? AND id = ?",
+                    (now + self.visibility_timeout, token, worker, updated_at, self.job, task_id))
+                leases.append((task_id, token, json.loads(task)))
+        return leases
+
+    # Function to push back the visibility timeout of leases that are still held
+    def extend(self, leases):
+        with self.transaction() as connection:
+            connection.executemany(
+                "UPDATE tasks SET visible_at = ? WHERE job = ? AND id = ? AND state = 'leased' AND lease_token = ?",
+                [(time.time() + self.visibility_timeout, self.job, task_id, token) for task_id, token, _ in leases])
+
+    # Function to record a page as done; only the first completion counts, so repeated or late ones are ignored
+    def complete(self, task_id, worker, content_hash):
+        with self.transaction() as connection:
+            return connection.execute(
+                "UPDATE tasks SET state = 'done', lease_token = NULL, completed_by = ?, content_hash = ?, error = NULL, "
+                "updated_at = ? WHERE job = ? AND id = ? AND state != 'done'",
+                (worker, content_hash, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), self.job, task_id)).rowcount == 1
+
+    # Function to give up a lease after an error, queueing the page again until it runs out of attempts
+    def fail(self, task_id, token, error):
+        with self.transaction() as connection:
+            connection.execute(
+                "UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, visible_at = ?, "
+                "lease_token = NULL, error = ?, updated_at = ? WHERE job = ? AND id = ? AND state = 'leased' "
+                "AND lease_token = ?", (self.max_attempts, time.time(), error,
+                                        time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), self.job, task_id, token))
+
+    # Function to count the pages of the job by state
+    def counts(self):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT state, COUNT(*) FROM tasks WHERE job = ? GROUP BY state", (self.job,)).fetchall()
+        counts = {state: dict(rows).get(state, 0) for state in ("queued", "leased", "done", "failed")}
+        counts["total"] = sum(counts.values())
+        return counts
+
+    # Function to get the worker and content hash each done page was completed with
+    def completions(self):
+        with self.lock:
+            return {task_id: (worker, digest) for task_id, worker, digest in self.connection.execute(
+                "SELECT id, completed_by, content_hash FROM tasks WHERE job = ? AND state = 'done'", (self.job,))}
+
+    # Function to list the failed pages with their last error
+    def failures(self):
+        with self.lock:
+            return self.connection.execute(
+                "SELECT id, error FROM tasks WHERE job = ? AND state = 'failed' ORDER BY id", (self.job,)).fetchall()
+
+    def close(self):
+        self.connection.close()
+
+# Class to share page tasks between nodes through a Redis-compatible server, using the server's clock for leases;
+# any client with the redis-py interface can be passed in, such as a local stand-in
+class RedisWorkQueue(WorkQueue):
+    def __init__(self, client, job="oracle-hcm", visibility_timeout=300, max_attempts=3):
+        super().__init__(job, visibility_timeout, max_attempts)
+        self.client = client
+        prefix = f"oracle-hcm:{job}"
+        self.tasks_key = f"{prefix}:tasks"  # id -> task
+        self.pending_key = f"{prefix}:pending"  # Sorted set of queued and leased ids by the time they become visible
+        self.leases_key = f"{prefix}:leases"  # id -> token of the current lease
+        self.attempts_key = f"{prefix}:attempts"
+        self.done_key = f"{prefix}:done"  # id -> worker and content hash of the first completion
+        self.failed_key = f"{prefix}:failed"  # id -> last error
+
+    # Function to get the time of the server, so leases do not depend on the clocks of the nodes
+    @staticmethod
+    def now(client):
+        seconds, microseconds = client.time()
+        return int(seconds) + int(microseconds) / 1e6
+
+    def publish(self, tasks, retry_failed=False):
+        tasks = {queue_task_id(task): json.dumps(task) for task in tasks}
+        pipeline = self.client.pipeline()
+        for task_id, task in tasks.items():
+            pipeline.hsetnx(self.tasks_key, task_id, task)
+        added = [task_id for task_id, new in zip(tasks, pipeline.execute()) if new]
+        queued = added + (self.client.hkeys(self.failed_key) if retry_failed else [])
+        if queued:
+            now = self.now(self.client)
+            pipeline = self.client.pipeline()
+            pipeline.zadd(self.pending_key, {task_id: now for task_id in queued}, nx=True)
+            pipeline.hdel(self.failed_key, *queued)
+            pipeline.hdel(self.attempts_key, *queued)
+            pipeline.execute()
+        return len(added)
+
+    def lease(self, worker, count):
+        # Helper function to claim pages inside a transaction that is retried when another node changes the queue
+        def claim(pipeline):
+            now = self.now(pipeline)
+            task_ids = pipeline.zrangebyscore(self.pending_key, "-inf", now, start=0, num=count)
+            if not task_ids:
+                return []
+            attempts = pipeline.hmget(self.attempts_key, task_ids)
+            tasks = pipeline.hmget(self.tasks_key, task_ids)
+            pipeline.multi()
+            leases = []
+            for task_id, attempt, task in zip(task_ids, attempts, tasks):
+                if int(attempt or 0) >= self.max_attempts:
+                    pipeline.zrem(self.pending_key, task_id)
+                    pipeline.hdel(self.leases_key, task_id)
+                    pipeline.hset(self.failed_key, task_id, f"Lease expired after {attempt} attempts")
+                    continue
+                token = uuid.uuid4().hex
+                pipeline.zadd(self.pending_key, {task_id: now + self.visibility_timeout})
+                pipeline.hset(self.leases_key, task_id, token)
+                pipeline.hincrby(self.attempts_key, task_id, 1)
+                leases.append((task_id, token, json.loads(task)))
+            return leases
+
+        return self.client.transaction(claim, self.pending_key, value_from_callable=True)
+
+    def extend(self, leases):
+        # Helper function to extend only the leases whose token is still current
+        def extend_held(pipeline):
+            tokens = pipeline.hmget(self.leases_key, [task_id for task_id, _, _ in leases])
+            visible_at = self.now(pipeline) + self.visibility_timeout
+            pipeline.multi()
+            for (task_id, token, _), current in zip(leases, tokens):
+                if current == token:
+                    pipeline.zadd(self.pending_key, {task_id: visible_at}, xx=True)
+
+        if leases:
+            self.client.transaction(extend_held, self.leases_key)
+
+    def complete(self, task_id, worker, content_hash):
+        record = json.dumps({"worker": worker, "content_hash": content_hash,
+                             "completed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())})
+        if not self.client.hsetnx(self.done_key, task_id, record):
+            return False
+        pipeline = self.client.pipeline()
+        pipeline.zrem(self.pending_key, task_id)
+        pipeline.hdel(self.leases_key, task_id)
+        pipeline.hdel(self.failed_key, task_id)
+        pipeline.execute()
+        return True
+
+    def fail(self, task_id, token, error):
+        # Helper function to give up the lease only if it is still held
+        def release(pipeline):
+            if pipeline.hget(self.leases_key, task_id) != token:
+                return
+            attempts = int(pipeline.hget(self.attempts_key, task_id) or 0)
+            now = self.now(pipeline)
+            pipeline.multi()
+            pipeline.hdel(self.leases_key, task_id)
+            if attempts >= self.max_attempts:
+                pipeline.zrem(self.pending_key, task_id)
+                pipeline.hset(self.failed_key, task_id, error)
+            else:
+                pipeline.zadd(self.pending_key, {task_id: now})
+
+        self.client.transaction(release, self.leases_key)
+
+    def counts(self):
+        pipeline = self.client.pipeline()
+        pipeline.hlen(self.tasks_key)
+        pipeline.hlen(self.done_key)
+        pipeline.hlen(self.failed_key)
+        pipeline.zcard(self.pending_key)
+        pipeline.hlen(self.leases_key)
+        total, done, failed, pending, leased = pipeline.execute()
+        return {"queued": pending - leased, "leased": leased, "done": done, "failed": failed, "total": total}
+
+    def completions(self):
+        return {task_id: (record["worker"], record["content_hash"])
+                for task_id, record in ((task_id, json.loads(record))
+                                        for task_id, record in self.client.hgetall(self.done_key).items())}
+
+    def failures(self):
+        return sorted(self.client.hgetall(self.failed_key).items())
+
+    def close(self):
+        self.client.close()
+
+# Function to open the work queue of a job: a redis:// URL or the path of a SQLite database on a shared filesystem
+def open_work_queue(url, job="oracle-hcm", visibility_timeout=300, max_attempts=3):
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        import redis
+
+        return RedisWorkQueue(redis.Redis.from_url(url, decode_responses=True), job, visibility_timeout, max_attempts)
+    path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else url
+    return SqliteWorkQueue(path, job, visibility_timeout, max_attempts)
+
+# Function to publish the pages of a release to a work queue
+def publish_release(work_queue, release=DEFAULT_RELEASE, base_url=None, section_names=None, cache_dir=".",
+                    refresh_manifest=False, retry_failed=False):
+    base_url = (base_url or release_base_url(release)).rstrip("/") + "/"
+    manifest = load_manifest(cache_dir, release, base_url, refresh=refresh_manifest)
+    sections = select_sections(manifest, section_names)
+    directories = {section["name"]: {"tables": None, "views": None} for section in sections}
+    tasks = [{"release": release, "base_url": base_url, "section": task["section"], "kind": task["kind"],
+              "name": task["name"], "url": task["url"]} for task in build_page_tasks(sections, directories)]
+    added = work_queue.publish(tasks, retry_failed)
+    print(f"Published {added} of {len(tasks)} pages of release {release} to job {work_queue.job}")
+    return added
+
+# Function to keep extending a worker's leases until it stops
+def keep_leases(work_queue, leases, stop):
+    while not stop.wait(work_queue.visibility_timeout / 3):
+        try:
+            work_queue.extend(leases)
+        except Exception as e:
+            print(f"Could not extend leases: {e}")
+
+# Function to lease pages from a work queue in batches and extract them into this node's output until no page is
+# queued or leased, so any number of nodes can share a release
+def run_queue_worker(work_queue, output, engine="selenium", workers=None, output_format="excel", batch_size=None,
+                     name=None, profile="default", max_rate=None, full=False, search_index=True, writers=1,
+                     write_queue_size=64, poll_interval=1, report_path=None):
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    workers = workers or (HTTP_WORKERS if engine == "http" else 4)
+    batch_size = batch_size or workers * 4  # Enough pages to keep every worker busy between two leases
+    os.makedirs(output, exist_ok=True)
+    driver_path = resolve_chromedriver(output) if engine != "http" else None
+    metrics = RunMetrics()
+    pool, pool_key = None, None  # One warm pool for the node, replaced when the release or site changes
+    print(f"Worker {name} taking pages from job {work_queue.job}...")
+    try:
+        while True:
+            leases = work_queue.lease(name, batch_size)
+            if not leases:
+                counts = work_queue.counts()
+                if not counts["queued"] and not counts["leased"]:
+                    break
+                time.sleep(poll_interval)  # Pages leased by other nodes come back when their leases expire
+                continue
+
+            stop = threading.Event()
+            threading.Thread(target=keep_leases, args=(work_queue, leases, stop), daemon=True).start()
+            try:
+                batches = defaultdict(list)
+                for task_id, token, task in leases:
+                    batches[(task["release"], task["base_url"])].append((task_id, token, task))
+                for (release, base_url), batch in batches.items():
+                    options = {
+                        "base_url": base_url,
+                        "compare": False,
+                        "release": release,
+                        "checkpoint_path": os.path.join(output, "checkpoints.sqlite"),
+                        "full": full,
+                        "output_format": output_format,
+                        "store_path": store_path(output, output_format) if output_format != "excel" else None,
+                        "writers": writers,
+                        "write_queue_size": write_queue_size,
+                        "profile": profile,
+                        "driver_path": driver_path,
+                        "driver_cache": output,
+                        "page_deadline": 240,
+                        "recycle_pages": 200,
+                        "recycle_mb": 1500,
+                        "search_path": os.path.join(output, "search.sqlite") if search_index else None,
+                        "quiet": False,
+                        "rate_limiters": {urlsplit(base_url).netloc: HostRateLimiter(max_rate)} if max_rate else {},
+                    }
+                    open_output(options).close()
+                    tasks = []
+                    for _, _, task in batch:
+                        save_dir = None
+                        if output_format == "excel":
+                            save_dir = create_save_directories(output, task["section"], task["kind"] == "tables",
+                                                               task["kind"] == "views")[task["kind"] == "views"]
+                        tasks.append({"section": task["section"], "kind": task["kind"], "name": task["name"],
+                                      "url": task["url"], "save_dir": save_dir})
+                    if engine == "http":
+                        process_sections_with_http(tasks, options, metrics, workers=workers)
+                    else:
+                        if pool and (pool_key != (release, base_url) or not pool.any_alive()):
+                            stop_browser_pool(pool, metrics)
+                            pool = None
+                        if pool is None:
+                            pool, pool_key = start_browser_pool(options, workers), (release, base_url)
+                        process_pages_with_browser_pool(tasks, options, metrics, pool_size=workers, supervisor=pool,
+                                                        keep_pool=True)
+
+                    # Report each page from its checkpoint, which the extraction left done or failed
+                    checkpoints = CheckpointStore(options["checkpoint_path"])
+                    try:
+                        for (task_id, token, _), task in zip(batch, tasks):
+                            checkpoint = checkpoints.get(release, task)
+                            if checkpoint and checkpoint["status"] == "done":
+                                if not work_queue.complete(task_id, name, checkpoint["content_hash"]):
+                                    metrics.counters["duplicate_completions"] += 1
+                            else:
+                                work_queue.fail(task_id, token, (checkpoint or {}).get("error") or "Not extracted")
+                                metrics.counters["queue_failures"] += 1
+                    finally:
+                        checkpoints.close()
+            finally:
+                stop.set()
+    finally:
+        if pool:
+            stop_browser_pool(pool, metrics)
+    report = metrics.write_report(report_path or os.path.join(output, "run-report.json"), engine=engine, worker=name,
+                                  job=work_queue.job)
+    statuses = metrics.statuses
+    print(f"Worker {name} finished: {statuses['written']} written, {statuses['unchanged']} unchanged, "
+          f"{statuses['failed']} failed ({report['pages_per_second']:.2f} pages/sec).")
+
+# Function to get the store a node wrote, whatever its output format
+def node_store_path(directory):
+    for output_format in ("blobs", "sqlite", "parquet"):
+        if os.path.exists(store_path(directory, output_format)):
+            return store_path(directory, output_format)
+    return directory
+
+# Function to merge the outputs of the nodes of a job into one output, taking each page from the node whose copy the
+# work queue recorded as completed, or else from the node that wrote it last
+def merge_outputs(sources, output, output_format="excel", work_queue=None, search_index=True):
+    completions = work_queue.completions() if work_queue else {}
+    owners, releases = {}, defaultdict(set)
+    for source in sources:
+        path = os.path.join(source, "checkpoints.sqlite")
+        if not os.path.exists(path):
+            print(f"Skipping {source}: no checkpoints.sqlite")
+            continue
+        connection = sqlite3.connect(path)
+        try:
+            rows = connection.execute("SELECT release, section, kind, page, content_hash, updated_at FROM pages "
+                                      "WHERE status = 'done'").fetchall()
+        finally:
+            connection.close()
+        for page_release, section, kind, page, digest, updated_at in rows:
+            key = f"{page_release}/{section}/{kind}/{page}"
+            rank = (completions.get(key, (None, None))[1] == digest, updated_at)
+            if key not in owners or rank > owners[key][0]:
+                owners[key] = (rank, source)
+            releases[source].add(page_release)
+
+    os.makedirs(output, exist_ok=True)
+    outputs, statuses = {}, Counter()
+    try:
+        for source in releases:
+            path = node_store_path(source)
+            # Workbooks do not record their release, so an Excel node is read as the release it checkpointed
+            for page_release, section, kind, page, data in iter_store_pages(
+                    path, max(releases[source]) if path == source else None):
+                if owners.get(f"{page_release}/{section}/{kind}/{page}", (None, None))[1] != source:
+                    continue
+                if page_release not in outputs:
+                    outputs[page_release] = open_output({
+                        "checkpoint_path": os.path.join(output, "checkpoints.sqlite"),
+                        "release": page_release,
+                        "output_format": output_format,
+                        "store_path": store_path(output, output_format) if output_format != "excel" else None,
+                        "search_path": os.path.join(output, "search.sqlite") if search_index else None,
+                    })
+                save_dir = None
+                if output_format == "excel":
+                    save_dir = create_save_directories(output, section, kind == "tables", kind == "views")[kind == "views"]
+                task = {"section": section, "kind": kind, "name": page, "url": None, "save_dir": save_dir}
+                page_output = outputs[page_release]
+                statuses[save_page(task, data, page_output, page_output.checkpoints.get(page_release, task))] += 1
+    finally:
+        for page_output in outputs.values():
+            page_output.close()
+    missing = sorted(task_id for task_id in completions if task_id not in owners)
+    for task_id in missing:
+        print(f"Completed page {task_id} is in none of the outputs")
+    print(f"Merged {len(owners)} pages from {len(releases)} nodes into {output}: {statuses['written']} written, "
+          f"{statuses['unchanged']} unchanged" + (f", {len(missing)} completed pages missing" if missing else ""))
+    return missing
+
+# Directory of the recorded documentation pages and the stored baseline of the bench command
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+
+# Function to serve a directory over HTTP on a free local port from a background thread
+def serve_directory(directory):
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    # Class to serve files without logging every request
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# Function to wait for a process while sampling the peak resident memory of it and of each worker process it starts
+def wait_sampling_rss(process, interval=0.1):
+    try:
+        import psutil
+    except ImportError:
+        process.wait()
+        return None  # psutil is optional
+    main_peak, worker_peaks = 0, {}
+    while process.poll() is None:
+        try:
+            root = psutil.Process(process.pid)
+            main_peak = max(main_peak, root.memory_info().rss)
+            for child in root.children():
+                # A browser worker's chromedriver and Chrome processes count towards that worker
+                rss = sum(member.memory_info().rss for member in [child] + child.children(recursive=True))
+                worker_peaks[child.pid] = max(worker_peaks.get(child.pid, 0), rss)
+        except psutil.Error:
+            pass  # Processes come and go between samples
+        time.sleep(interval)
+    return {"main": round(main_peak / 2 ** 20, 1),
+            "workers": sorted((round(peak / 2 ** 20, 1) for peak in worker_peaks.values()), reverse=True)}
+
+# Function to add up the size of the files under a directory, skipping bookkeeping files
+def directory_bytes(directory, skip=()):
+    total = 0
+    for root, _, files in os.walk(directory):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files
+                     if not any(name.startswith(prefix) for prefix in skip))
+    return total
+
+# Function to read the content hash of every page extracted in a run from its checkpoints
+def extraction_hashes(directory):
+    connection = sqlite3.connect(os.path.join(directory, "checkpoints.sqlite"))
+    try:
+        return {f"{section}/{kind}/{page}": content_hash
+                for section, kind, page, content_hash in connection.execute(
+                    "SELECT section, kind, page, content_hash FROM pages WHERE status = 'done'")}
+    finally:
+        connection.close()
+
+# Function to run one benchmark case as a separate extraction process against the local server
+def run_benchmark_case(engine, output_format, profile, base_url, workers, directory):
+    command = [sys.executable, os.path.abspath(__file__), "--engine", engine, "--output-format", output_format,
+               "--profile", profile, "--base-url", base_url, "--output", directory, "--workers", str(workers)]
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "bench.log"), "w") as log:
+        start, launched = time.perf_counter(), time.time()
+        process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+        peak_rss_mb = wait_sampling_rss(process)
+        seconds = time.perf_counter() - start
+    if process.returncode != 0 or not os.path.exists(os.path.join(directory, "run-report.json")):
+        with open(os.path.join(directory, "bench.log")) as log:
+            raise RuntimeError(f"{engine}/{output_format}/{profile} run failed:\n{log.read()[-2000:]}")
+    with open(os.path.join(directory, "run-report.json")) as file:
+        report = json.load(file)
+    return {
+        "seconds": round(seconds, 3),
+        "pages": report["pages"],
+        "pages_per_second": round(report["pages_per_second"], 2),
+        # From launching the process, so interpreter start and imports count too
+        "time_to_first_page": round(report["startup"]["first_page_at"] - launched, 3)
+                              if report["startup"]["first_page_at"] else None,
+        "stages": {stage: {"count": summary["count"], "p50": round(summary["p50"], 6), "p95": round(summary["p95"], 6)}
+                   for stage, summary in report["stages"].items()},
+        "peak_rss_mb": peak_rss_mb,
+        "output_bytes": directory_bytes(directory, skip=("checkpoints.sqlite", "search.sqlite", "run-report.json",
+                                                         "toc-manifest-", "bench.log")),
+        "index_bytes": directory_bytes(directory) - directory_bytes(directory, skip=("search.sqlite",)),
+        "hashes": extraction_hashes(directory),
+    }
+
+# Function to list how a benchmark result regressed from its baseline by more than the threshold; stage latencies
+# must also be slower by min_stage_seconds and are only compared for stages with min_stage_samples samples, since
+# stages timed once per run (the manifest, or the write and index of a batched output) vary by more than any
+# threshold and are covered by the throughput, and the time to the first page must be slower by min_startup_seconds
+def find_regressions(name, result, baseline, threshold, min_stage_seconds=0.005, min_stage_samples=5,
+                     min_startup_seconds=0.1):
+    regressions = []
+    if result["pages_per_second"] < baseline["pages_per_second"] * (1 - threshold):
+        regressions.append(f"{name}: {result['pages_per_second']:.1f} pages/sec, baseline {baseline['pages_per_second']:.1f}")
+    if result.get("time_to_first_page") and baseline.get("time_to_first_page") and \
+            result["time_to_first_page"] > baseline["time_to_first_page"] * (1 + threshold) + min_startup_seconds:
+        regressions.append(f"{name}: first page after {result['time_to_first_page']:.2f} s, "
+                           f"baseline {baseline['time_to_first_page']:.2f} s")
+    for stage, latency in baseline.get("stages", {}).items():
+        current = result["stages"].get(stage)
+        if current and current["count"] >= min_stage_samples and \
+                current["p50"] > latency["p50"] * (1 + threshold) + min_stage_seconds:
+            regressions.append(f"{name}: {stage} p50 {current['p50'] * 1000:.1f} ms, baseline {latency['p50'] * 1000:.1f} ms")
+    if result["peak_rss_mb"] and baseline.get("peak_rss_mb") and \
+            result["peak_rss_mb"]["main"] > baseline["peak_rss_mb"]["main"] * (1 + threshold):
+        regressions.append(f"{name}: peak RSS {result['peak_rss_mb']['main']} MB, baseline {baseline['peak_rss_mb']['main']} MB")
+    if result["output_bytes"] > baseline["output_bytes"] * (1 + threshold):
+        regressions.append(f"{name}: {result['output_bytes']} output bytes, baseline {baseline['output_bytes']}")
+    return regressions
+
+# Function to benchmark each engine, output backend and browser profile on the recorded pages, check that they all
+# extract the same content, and compare the results with the stored baseline
+def run_benchmarks(engines=("http",), output_formats=("excel", "sqlite", "parquet", "blobs"), profiles=("default",),
+                   fixtures=None, baseline_path=None, threshold=None, repeat=3, workers=4, update_baseline=False,
+                   results_path=None):
+    fixtures = fixtures or os.path.join(BENCHMARK_DIR, "fixtures")
+    baseline_path = baseline_path or os.path.join(BENCHMARK_DIR, "baseline.json")
+    server = serve_directory(fixtures)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    cases = [(engine, output_format, profile) for engine in engines for output_format in output_formats
+             for profile in (profiles if engine == "selenium" else ("default",))]
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix="oracle-bench-") as scratch:
+            for engine, output_format, profile in cases:
+                name = f"{engine}/{output_format}/{profile}"
+                runs = [run_benchmark_case(engine, output_format, profile, base_url, workers,
+                                           os.path.join(scratch, name.replace("/", "-"), str(attempt)))
+                        for attempt in range(repeat)]
+                # Keep the median run by throughput, so one noisy run neither fails nor hides a regression
+                results[name] = sorted(runs, key=lambda run: run["pages_per_second"])[len(runs) // 2]
+                result = results[name]
+                rss = result["peak_rss_mb"] or {}
+                print(f"{name:28} {result['pages_per_second']:8.1f} pages/sec  {sum(result['pages'].values()):4} pages  "
+                      f"first page {result['time_to_first_page']} s  peak RSS {rss.get('main', '?')} MB (workers {rss.get('workers', '?')})  "
+                      f"{result['output_bytes']} output bytes")
+    finally:
+        server.shutdown()
+
+    # Every engine, backend and profile must extract exactly the same pages
+    problems = []
+    reference_name, reference = next(iter(results.items()))
+    for name, result in results.items():
+        differing = sorted(page for page in reference["hashes"].keys() | result["hashes"].keys()
+                           if reference["hashes"].get(page) != result["hashes"].get(page))
+        if differing:
+            problems.append(f"{name} extracted different content from {reference_name} for {len(differing)} pages: "
+                            f"{', '.join(differing[:5])}")
+
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+    if threshold is None:
+        threshold = baseline.get("threshold", 0.25)
+    for name, result in results.items():
+        if name in baseline.get("cases", {}):
+            problems += find_regressions(name, result, baseline["cases"][name], threshold)
+        else:
+            print(f"No baseline for {name}")
 
-    # Create save directories dynamically for all sections
-    directories = {}
-    for section_name, create_tables, create_views in sections:
-        tables_dir, views_dir = create_save_directories(base_path, section_name, create_tables, create_views)
-        directories[section_name] = {"tables": tables_dir, "views": views_dir}
+    summary = {name: {key: value for key, value in result.items() if key != "hashes"} for name, result in results.items()}
+    if results_path:
+        write_atomically(results_path, json.dumps(summary, indent=1))
+    if update_baseline:
+        baseline.setdefault("cases", {}).update(summary)
+        baseline.setdefault("threshold", threshold)
+        write_atomically(baseline_path, json.dumps(baseline, indent=1, sort_keys=True) + "\n")
+        print(f"Updated baseline {baseline_path}")
+    return problems
 
-    # Process all sections
-    print("Processing all sections...")
-    process_sections_with_pool(sections, directories, pool_size=15)
-    print("Data extraction completed for all sections.")
+# Function to parse the command line options
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Extract the Oracle HCM tables and views reference into Excel files.")
+    parser.add_argument("--engine", choices=("selenium", "http"), default="selenium",
+                        help="selenium drives headless Chrome; http fetches the static topic pages and parses them with lxml")
+    parser.add_argument("--output", help="Directory to save the Excel files to (prompted for when omitted)")
+    parser.add_argument("--workers", type=int, help="Number of browsers (selenium) or concurrent fetches (http)")
+    parser.add_argument("--release", default=DEFAULT_RELEASE,
+                        help=f"Documentation release to extract, e.g. 24d or 25b (default: {DEFAULT_RELEASE})")
+    parser.add_argument("--base-url", help="Documentation root, e.g. a local server hosting saved pages")
+    parser.add_argument("--sections", nargs="+", metavar="SECTION",
+                        help="Only process these sections, by name (11-Global-Payroll) or number (11)")
+    parser.add_argument("--refresh-manifest", action="store_true",
+                        help="Rediscover the table of contents even if the cached manifest is current")
+    parser.add_argument("--skip-toc-check", action="store_true",
+                        help="Use the cached manifest without checking whether the table of contents changed")
+    parser.add_argument("--full", action="store_true",
+                        help="Re-extract and rewrite every page instead of skipping checkpointed, unchanged pages")
+    parser.add_argument("--output-format", choices=("excel", "sqlite", "parquet", "blobs"), default="excel",
+                        help="excel writes one workbook per page; sqlite and parquet append every page to normalised "
+                             "datasets (tables, columns, primary_keys, indexes, foreign_keys, views, view_queries); "
+                             "blobs stores each distinct page once by content hash with a manifest per release")
+    parser.add_argument("--profile", choices=("default", "lean"), default="default",
+                        help="selenium only: lean blocks images, fonts, media and third-party hosts, uses the eager "
+                             "page load strategy and skips the index page, consent click, refresh and zoom")
+    parser.add_argument("--refresh-driver", action="store_true",
+                        help="selenium only: resolve chromedriver again instead of reusing the cached chromedriver.json")
+    parser.add_argument("--page-deadline", type=float, default=240,
+                        help="selenium only: seconds a browser may spend on one page before it is killed and replaced "
+                             "and the page requeued (default: 240)")
+    parser.add_argument("--recycle-pages", type=int, default=200,
+                        help="selenium only: restart each browser after this many pages (default: 200)")
+    parser.add_argument("--recycle-mb", type=float, default=1500,
+                        help="selenium only: restart a browser once its memory exceeds this many MB (default: 1500)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="selenium only: grow and shrink the number of browsers at runtime from measured memory, "
+                             "CPU load, page latency and error rate, starting from --workers")
+    parser.add_argument("--min-workers", type=int, default=2, help="Fewest browsers --adaptive scales down to")
+    parser.add_argument("--max-workers", type=int, help="Most browsers --adaptive scales up to (default: 15)")
+    parser.add_argument("--max-rate", type=float, help="Cap on requests per second to each documentation host")
+    parser.add_argument("--writers", type=int, default=1,
+                        help="Number of writer threads (http) or processes (selenium) saving extracted pages")
+    parser.add_argument("--write-queue-size", type=int, default=64,
+                        help="Extracted pages that may wait for a writer before the extracting workers block")
+    parser.add_argument("--no-search-index", action="store_true",
+                        help="Do not keep the full-text search index (search.sqlite in the output directory) up to date")
+    parser.add_argument("--report", help="Path of the JSON run report (default: run-report.json in the output directory)")
+    parser.add_argument("--prometheus-textfile", help="Path of a Prometheus textfile kept up to date during the run")
+    parser.add_argument("--compare-extraction", action="store_true",
+                        help="selenium only: also run the per-cell extractors on each page and print timings and mismatches")
+    return parser.parse_args(argv)
+
+# Command to export a consolidated SQLite/Parquet store to one workbook per page
+def export_excel_command(argv):
+    parser = argparse.ArgumentParser(prog="script.py export-excel", description="Export a consolidated store to Excel files.")
+    parser.add_argument("store", help="hcm.sqlite file, parquet directory or store directory written with --output-format")
+    parser.add_argument("output", help="Directory to write <release>/<section>/Tables|Views/<page>.xlsx to")
+    parser.add_argument("--release", help="Only export this release")
+    args = parser.parse_args(argv)
+    export_excel(args.store, args.output, args.release)
+
+# Command to build and query the schema catalog
+def catalog_command(argv):
+    parser = argparse.ArgumentParser(prog="script.py catalog", description="Build and query the schema catalog.")
+    parser.add_argument("--catalog", default="catalog.sqlite", help="Catalog database (default: catalog.sqlite)")
+    parser.add_argument("--release", help="Release to build or query (default: every release / the latest release)")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    subparsers.add_parser("build", help="Catalog a store or Excel output directory").add_argument(
+        "source", help="hcm.sqlite file, parquet directory or Excel output directory")
+    subparsers.add_parser("columns", help="Tables and views that have a column").add_argument("column")
+    subparsers.add_parser("neighbors", help="Foreign key neighbours of a table").add_argument("table")
+    path_parser = subparsers.add_parser("path", help="Shortest foreign key join path between two tables")
+    path_parser.add_argument("source")
+    path_parser.add_argument("target")
+    args = parser.parse_args(argv)
+
+    if args.action == "build":
+        build_catalog(args.source, args.catalog, args.release)
+        return
+    catalog = SchemaCatalog(args.catalog, args.release)
+    try:
+        if args.action == "columns":
+            for table, kind, section, datatype in catalog.tables_with_column(args.column):
+                print(f"{table}\t{kind or ''}\t{section or ''}\t{datatype or ''}")
+        elif args.action == "neighbors":
+            for table, column, direction in catalog.neighbors(args.table):
+                print(f"{direction} {table} on {column}")
+        else:
+            path = catalog.join_path(args.source, args.target)
+            if path is None:
+                print(f"No foreign key join path between {args.source.upper()} and {args.target.upper()}")
+            for step in path or []:
+                print(f"{step['from']} JOIN {step['to']} ON {step['column']}")
+    finally:
+        catalog.close()
+
+# Command to build and query the full-text search index
+def search_command(argv):
+    parser = argparse.ArgumentParser(prog="script.py search", description="Search page descriptions, details, "
+                                     "columns and view queries.")
+    parser.add_argument("--index", default="search.sqlite", help="Search index (default: search.sqlite)")
+    parser.add_argument("--build", metavar="SOURCE",
+                        help="First index a hcm.sqlite file, parquet directory or Excel output directory")
+    parser.add_argument("--release", help="Only index or search this release")
+    parser.add_argument("--section", help="Only search this section, e.g. 11-Global-Payroll")
+    parser.add_argument("--kind", choices=("tables", "views"), help="Only search tables or views")
+    parser.add_argument("--limit", type=int, default=20, help="Number of results (default: 20)")
+    parser.add_argument("query", nargs="?", help="FTS5 query, e.g. 'person NEAR(assignment)' or 'payroll AND element*'")
+    args = parser.parse_args(argv)
+
+    index = SearchIndex(args.index)
+    try:
+        if args.build:
+            updated = index.update((page_release, section, kind, page, data, content_hash(data))
+                                   for page_release, section, kind, page, data in iter_store_pages(args.build, args.release))
+            print(f"Indexed {updated} new or changed pages from {args.build} into {args.index}")
+        if args.query:
+            start = time.perf_counter()
+            try:
+                results = index.search(args.query, args.release, args.section, args.kind, args.limit)
+            except sqlite3.OperationalError as e:
+                sys.exit(f"Invalid search query {args.query!r}: {e}")
+            for page_release, section, kind, page, score, snippet in results:
+                print(f"{score:8.2f}  {page_release} {section} {kind[:-1]} {page}\n          {' '.join(snippet.split())}")
+            print(f"{len(results)} results in {(time.perf_counter() - start) * 1000:.1f} ms")
+    finally:
+        index.close()
+
+# Command to list the tables, views and columns added, removed or changed between two releases of a blob store
+def diff_command(argv):
+    parser = argparse.ArgumentParser(prog="script.py diff", description="Compare two releases of a blob store.")
+    parser.add_argument("store", help="store directory written with --output-format blobs, or the output directory "
+                                      "of that run")
+    parser.add_argument("old_release", help="Release to compare from, e.g. 24d")
+    parser.add_argument("new_release", help="Release to compare to, e.g. 25a")
+    parser.add_argument("--json", action="store_true", help="Print the differences as JSON")
+    args = parser.parse_args(argv)
+    try:
+        diff = diff_releases(args.store, args.old_release, args.new_release)
+    except ValueError as e:
+        sys.exit(str(e))
+    if args.json:
+        print(json.dumps(diff, indent=2))
+        return
+
+    for change in ("added", "removed"):
+        for entry in diff[change]:
+            print(f"{change:8} {entry['kind'][:-1]} {entry['page']} ({entry['section']})")
+    for entry in diff["changed"]:
+        columns = [f"columns {change} {', '.join(entry['columns_' + change])}"
+                   for change in ("added", "removed", "changed") if entry["columns_" + change]]
+        print(f"changed  {entry['kind'][:-1]} {entry['page']} ({entry['section']}): "
+              f"{'; '.join(columns) or 'details only'}")
+    print(f"{len(diff['added'])} added, {len(diff['removed'])} removed, {len(diff['changed'])} changed, "
+          f"{diff['unchanged']} unchanged from {args.old_release} to {args.new_release}")
+
+# Command to benchmark the engines and output backends offline against the recorded documentation pages
+def bench_command(argv):
+    parser = argparse.ArgumentParser(prog="script.py bench", description="Benchmark extraction on recorded pages.")
+    parser.add_argument("--engines", nargs="+", choices=("http", "selenium"), default=["http"],
+                        help="Engines to benchmark (default: http; selenium needs Chrome)")
+    parser.add_argument("--output-formats", nargs="+", choices=("excel", "sqlite", "parquet", "blobs"),
+                        default=["excel", "sqlite", "parquet", "blobs"], help="Output backends to benchmark")
+    parser.add_argument("--profiles", nargs="+", choices=("default", "lean"), default=["default", "lean"],
+                        help="Browser profiles to benchmark with the selenium engine")
+    parser.add_argument("--fixtures", help="Directory of recorded pages to serve (default: benchmarks/fixtures)")
+    parser.add_argument("--baseline", help="Baseline to compare with (default: benchmarks/baseline.json)")
+    parser.add_argument("--threshold", type=float,
+                        help="Allowed regression as a fraction of the baseline (default: the baseline's, else 0.25)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the median is kept (default: 3)")
+    parser.add_argument("--workers", type=int, default=4, help="Browsers or concurrent fetches per run (default: 4)")
+    parser.add_argument("--results", help="Also write the results as JSON to this path")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args(argv)
+    problems = run_benchmarks(args.engines, args.output_formats, args.profiles, args.fixtures, args.baseline,
+                              args.threshold, args.repeat, args.workers, args.update_baseline, args.results)
+    for problem in problems:
+        print(f"FAIL {problem}")
+    if problems:
+        sys.exit(1)
+    print("Benchmark passed")
+
+# Function to add the options of the work queue shared by the worker and coordinator commands
+def add_queue_arguments(parser):
+    parser.add_argument("--queue", required=True,
+                        help="redis://host:6379/0 or the path of a SQLite queue on a filesystem every node mounts")
+    parser.add_argument("--job", default="oracle-hcm", help="Name of the job in the queue (default: oracle-hcm)")
+    parser.add_argument("--visibility-timeout", type=float, default=300,
+                        help="Seconds a leased page stays hidden from other nodes without its lease being extended "
+                             "(default: 300)")
+    parser.add_argument("--max-attempts", type=int, default=3,
+                        help="Leases of a page before it is failed (default: 3)")
+
+# Command to extract the pages of a shared work queue on this node
+def worker_command(argv):
+    parser = argparse.ArgumentParser(prog="script.py worker", description="Extract pages leased from a shared work "
+                                     "queue until it is drained.")
+    add_queue_arguments(parser)
+    parser.add_argument("--output", required=True, help="Directory of this node's output")
+    parser.add_argument("--engine", choices=("selenium", "http"), default="selenium", help="Extraction engine")
+    parser.add_argument("--workers", type=int, help="Number of browsers (selenium) or concurrent fetches (http)")
+    parser.add_argument("--output-format", choices=("excel", "sqlite", "parquet", "blobs"), default="excel",
+                        help="Output backend of this node")
+    parser.add_argument("--batch-size", type=int, help="Pages leased at a time (default: four per worker)")
+    parser.add_argument("--name", help="Name of this worker in the queue (default: <host>-<pid>)")
+    parser.add_argument("--profile", choices=("default", "lean"), default="default", help="selenium only: browser profile")
+    parser.add_argument("--max-rate", type=float, help="Cap on requests per second to each documentation host")
+    parser.add_argument("--full", action="store_true", help="Re-extract pages this node already has")
+    parser.add_argument("--no-search-index", action="store_true", help="Do not keep a search index on this node")
+    parser.add_argument("--report", help="Path of the JSON run report (default: run-report.json in the output directory)")
+    args = parser.parse_args(argv)
+    work_queue = open_work_queue(args.queue, args.job, args.visibility_timeout, args.max_attempts)
+    try:
+        run_queue_worker(work_queue, args.output, args.engine, args.workers, args.output_format, args.batch_size,
+                         args.name, args.profile, args.max_rate, args.full, not args.no_search_index,
+                         report_path=args.report)
+    finally:
+        work_queue.close()
+
+# Command to publish a release to a shared work queue, follow its progress and merge the outputs of the nodes
+def coordinator_command(argv):
+    parser = argparse.ArgumentParser(prog="script.py coordinator", description="Distribute a release over nodes "
+                                     "running the worker command.")
+    add_queue_arguments(parser)
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    publish_parser = subparsers.add_parser("publish", help="Queue the pages of a release")
+    publish_parser.add_argument("--release", default=DEFAULT_RELEASE, help=f"Release to queue (default: {DEFAULT_RELEASE})")
+    publish_parser.add_argument("--base-url", help="Documentation root, e.g. a local server hosting saved pages")
+    publish_parser.add_argument("--sections", nargs="+", metavar="SECTION", help="Only queue these sections")
+    publish_parser.add_argument("--manifest-dir", default=".", help="Directory of the cached TOC manifest (default: .)")
+    publish_parser.add_argument("--refresh-manifest", action="store_true", help="Rediscover the table of contents")
+    publish_parser.add_argument("--retry-failed", action="store_true", help="Also queue failed pages again")
+    subparsers.add_parser("status", help="Count the pages by state and list the failed ones")
+    wait_parser = subparsers.add_parser("wait", help="Wait until no page is queued or leased")
+    wait_parser.add_argument("--interval", type=float, default=10, help="Seconds between progress lines (default: 10)")
+    merge_parser = subparsers.add_parser("merge", help="Merge the output directories of the nodes")
+    merge_parser.add_argument("--output", required=True, help="Directory of the merged output")
+    merge_parser.add_argument("--output-format", choices=("excel", "sqlite", "parquet", "blobs"), default="excel",
+                              help="Output backend of the merged output")
+    merge_parser.add_argument("--no-search-index", action="store_true", help="Do not build a merged search index")
+    merge_parser.add_argument("sources", nargs="+", help="Output directories of the nodes")
+    args = parser.parse_args(argv)
+
+    work_queue = open_work_queue(args.queue, args.job, args.visibility_timeout, args.max_attempts)
+    try:
+        if args.action == "publish":
+            publish_release(work_queue, args.release, args.base_url, args.sections, args.manifest_dir,
+                            args.refresh_manifest, args.retry_failed)
+        elif args.action == "merge":
+            if merge_outputs(args.sources, args.output, args.output_format, work_queue, not args.no_search_index):
+                sys.exit(1)
+        else:
+            counts = work_queue.wait(args.interval) if args.action == "wait" else work_queue.counts()
+            if args.action == "status":
+                print(f"{counts['done']} done, {counts['failed']} failed, {counts['leased']} leased, "
+                      f"{counts['queued']} queued of {counts['total']} pages")
+            for task_id, error in work_queue.failures():
+                print(f"failed {task_id}: {error}")
+            if args.action == "wait" and counts["failed"]:
+                sys.exit(1)
+    finally:
+        work_queue.close()
+
+# Subcommands besides the default extraction run
+COMMANDS = {
+    "export-excel": export_excel_command,
+    "catalog": catalog_command,
+    "search": search_command,
+    "diff": diff_command,
+    "bench": bench_command,
+    "worker": worker_command,
+    "coordinator": coordinator_command,
+}
+
+# Function to run a subcommand, or the extraction when none is given
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+    args = parse_args(argv)
+    extract_data_with_pool(engine=args.engine, output=args.output, workers=args.workers, base_url=args.base_url,
+                           compare=args.compare_extraction, release=args.release, section_names=args.sections,
+                           refresh_manifest=args.refresh_manifest, check_toc=not args.skip_toc_check, full=args.full,
+                           report_path=args.report, prometheus_path=args.prometheus_textfile,
+                           output_format=args.output_format, writers=args.writers,
+                           write_queue_size=args.write_queue_size, adaptive=args.adaptive,
+                           min_workers=args.min_workers, max_workers=args.max_workers, max_rate=args.max_rate,
+                           profile=args.profile, search_index=not args.no_search_index,
+                           page_deadline=args.page_deadline, recycle_pages=args.recycle_pages,
+                           recycle_mb=args.recycle_mb, refresh_driver=args.refresh_driver)
 
 # Start the batch extraction process
 if __name__ == "__main__":
-    extract_data_with_pool()
+    main()
 
 # End of script
-
@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import script  # noqa: E402
+
+
+# Fixture to serve the recorded documentation pages the benchmark uses over a local HTTP server
+@pytest.fixture(scope="session")
+def fixture_url():
+    server = script.serve_directory(os.path.join(ROOT, "benchmarks", "fixtures"))
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+
+# Class to replace the time module of the script with a clock that can be moved forward
+class Clock:
+    def __init__(self):
+        self.offset = 0
+
+    def time(self):
+        return time.time() + self.offset
+
+    def advance(self, seconds):
+        self.offset += seconds
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+# Fixture to let a test move the script's clock forward instead of sleeping
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(script, "time", clock)
+    return clock
@@ -0,0 +1,20 @@
+import script
+
+
+# Helper function to build a benchmark result with the given stage latencies as (count, p50) pairs
+def bench_result(**stages):
+    return {"pages_per_second": 50.0, "time_to_first_page": 1.0, "peak_rss_mb": None, "output_bytes": 1000,
+            "stages": {stage: {"count": count, "p50": p50, "p95": p50} for stage, (count, p50) in stages.items()}}
+
+
+def test_stages_timed_once_per_run_are_not_compared():
+    baseline = bench_result(manifest=(1, 0.1131), fetch=(25, 0.0098))
+    result = bench_result(manifest=(1, 0.1526), fetch=(25, 0.0099))
+    assert script.find_regressions("http/blobs/default", result, baseline, 0.25) == []
+
+
+def test_slower_stages_timed_per_page_regress():
+    baseline = bench_result(fetch=(25, 0.0098), extract=(25, 0.0204))
+    result = bench_result(fetch=(25, 0.0099), extract=(25, 0.0400))
+    assert script.find_regressions("http/sqlite/default", result, baseline, 0.25) == \
+        ["http/sqlite/default: extract p50 40.0 ms, baseline 20.4 ms"]
@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+import script
+
+
+def test_diff_releases_of_a_run_output_directory(fixture_url, tmp_path):
+    for release in ("25a", "25b"):
+        script.extract_data_with_pool(engine="http", output=str(tmp_path), base_url=fixture_url, release=release,
+                                      output_format="blobs", workers=4, search_index=False)
+    diff = script.diff_releases(str(tmp_path), "25a", "25b")
+    assert diff == script.diff_releases(str(tmp_path / "store"), "25a", "25b")
+    assert diff == {"added": [], "removed": [], "changed": [], "unchanged": 25}
+
+
+def test_diff_releases_refuses_a_directory_without_a_store(tmp_path):
+    with pytest.raises(ValueError, match="not a blob store"):
+        script.diff_releases(str(tmp_path), "25a", "25b")
+    assert os.listdir(tmp_path) == []
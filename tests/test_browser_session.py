@@ -0,0 +1,61 @@
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
+
+import script
+
+
+@pytest.fixture
+def resolutions(monkeypatch):
+    resolutions = []
+
+    # Helper function to record each chromedriver resolution instead of installing a driver
+    def resolve(cache_dir=None, refresh=False):
+        resolutions.append(refresh)
+        return "/renewed/chromedriver" if refresh else "/cached/chromedriver"
+
+    monkeypatch.setattr(script, "resolve_chromedriver", resolve)
+    return resolutions
+
+
+def options():
+    return {"base_url": "http://127.0.0.1/", "profile": "default", "driver_path": None, "driver_cache": "/output"}
+
+
+def test_stale_driver_is_resolved_again_once(monkeypatch, resolutions):
+    paths = []
+
+    # Helper function to refuse sessions from the stale driver, like Chrome after an update
+    def start(base_url, profile, driver_path):
+        paths.append(driver_path)
+        if driver_path == "/cached/chromedriver":
+            raise SessionNotCreatedException("This version of ChromeDriver only supports Chrome version 120")
+        return "driver"
+
+    monkeypatch.setattr(script, "start_webdriver_session", start)
+    worker_options = options()
+    assert script.start_browser_session(worker_options) == "driver"
+    assert paths == ["/cached/chromedriver", "/renewed/chromedriver"]
+    assert resolutions == [False, True]
+    assert worker_options["driver_path"] == "/renewed/chromedriver"
+
+
+def test_other_start_up_errors_do_not_resolve_the_driver(monkeypatch, resolutions):
+    # Helper function to time out on the index page
+    def start(base_url, profile, driver_path):
+        raise TimeoutException("index page did not load")
+
+    monkeypatch.setattr(script, "start_webdriver_session", start)
+    with pytest.raises(TimeoutException):
+        script.start_browser_session(options())
+    assert resolutions == [False]
+
+
+def test_driver_refused_twice_raises(monkeypatch, resolutions):
+    # Helper function to refuse every session
+    def start(base_url, profile, driver_path):
+        raise SessionNotCreatedException("Chrome failed to start")
+
+    monkeypatch.setattr(script, "start_webdriver_session", start)
+    with pytest.raises(SessionNotCreatedException):
+        script.start_browser_session(options())
+    assert resolutions == [False, True]
@@ -0,0 +1,168 @@
+import queue
+import threading
+
+import pytest
+
+import script
+
+TASK = {"section": "11-Global-Payroll", "kind": "tables", "name": "PAY_RUN_RESULTS", "url": "http://127.0.0.1/a.html",
+        "save_dir": None}
+
+
+# Class to stand in for a browser worker process, alive until it exits or is killed
+class FakeProcess:
+    def __init__(self, target=None, args=()):
+        self.stop_event = args[-1]
+        self.exitcode = None
+        self.killed = False
+        self.pid = None
+
+    def start(self):
+        pass
+
+    def is_alive(self):
+        return self.exitcode is None
+
+    def exit(self, code=0):
+        self.exitcode = code
+
+    def kill(self):
+        if self.is_alive():
+            self.killed = True
+            self.exitcode = -9
+
+    def join(self, timeout=None):
+        pass
+
+
+@pytest.fixture
+def supervisor(monkeypatch, clock):
+    monkeypatch.setattr(script, "Process", FakeProcess)
+    monkeypatch.setattr(script, "Event", threading.Event)
+    monkeypatch.setattr(script, "kill_process_tree", lambda process: process.kill())
+    supervisor = script.BrowserSupervisor(queue.Queue(), queue.Queue(), queue.Queue(), [], {"release": "25a"},
+                                          page_deadline=240)
+    supervisor.checkpoints = script.CheckpointStore(":memory:")
+    supervisor.metrics = script.RunMetrics()
+    supervisor.start_worker()
+    supervisor.record(0, None, None)  # The browser session is up
+    yield supervisor
+    supervisor.checkpoints.close()
+
+
+# Helper function to run one check of the supervisor
+def check(supervisor, drain=None):
+    return supervisor.check(supervisor.checkpoints, supervisor.metrics, drain)
+
+
+# Helper function to get the process of a worker
+def process(supervisor, worker_id=0):
+    return supervisor.workers[worker_id][0]
+
+
+def test_crashed_worker_is_replaced_and_its_page_requeued(supervisor):
+    supervisor.record(0, dict(TASK), "started")
+    process(supervisor).exit(9)
+    assert check(supervisor) == []
+    assert supervisor.task_queue.get_nowait()["name"] == "PAY_RUN_RESULTS"
+    assert list(supervisor.workers) == [0, 1] and process(supervisor, 1).is_alive()
+    assert supervisor.metrics.counters["worker_restarts"] == 1
+
+
+def test_worker_that_finished_its_page_and_exited_is_retired(supervisor):
+    supervisor.record(0, dict(TASK), "started")
+    process(supervisor).exit(0)
+    check(supervisor, drain=lambda: supervisor.record(0, dict(TASK), "written"))
+    assert 0 in supervisor.retired
+    assert list(supervisor.workers) == [0]
+    assert supervisor.task_queue.empty()
+
+
+def test_hung_worker_is_asked_to_stop_before_it_is_killed(supervisor, clock):
+    supervisor.record(0, dict(TASK), "started")
+    clock.advance(241)
+    check(supervisor)
+    assert supervisor.workers[0][1].is_set() and not process(supervisor).killed
+    clock.advance(supervisor.stop_grace - 1)
+    check(supervisor)
+    assert not process(supervisor).killed and list(supervisor.workers) == [0]
+    clock.advance(2)
+    check(supervisor)
+    assert process(supervisor).killed
+    assert supervisor.task_queue.get_nowait()["name"] == "PAY_RUN_RESULTS"
+    assert process(supervisor, 1).is_alive()
+
+
+def test_worker_that_stops_in_its_grace_period_is_not_killed(supervisor, clock):
+    clock.advance(script.HEARTBEAT_TIMEOUT + 1)
+    check(supervisor)
+    process(supervisor).exit(0)
+    check(supervisor, drain=lambda: None)
+    assert not process(supervisor).killed
+    assert process(supervisor, 1).is_alive()  # Replaced, since it only stopped because it was asked to
+
+
+def test_worker_waiting_for_the_writers_is_not_stopped(supervisor, clock):
+    supervisor.record(0, dict(TASK), "started")
+    for _ in range(60):
+        clock.advance(5)
+        supervisor.record(0, None, "writing")
+    check(supervisor)
+    assert not supervisor.workers[0][1].is_set()
+    clock.advance(script.HEARTBEAT_TIMEOUT + 1)  # The writing heartbeats stopped
+    check(supervisor)
+    assert supervisor.workers[0][1].is_set()
+
+
+def test_worker_stuck_starting_a_browser_is_stopped(supervisor, clock):
+    supervisor.record(0, None, "session_start")
+    clock.advance(supervisor.session_deadline - 1)
+    check(supervisor)
+    assert not supervisor.workers[0][1].is_set()  # Silent for longer than the heartbeat timeout, but starting
+    clock.advance(2)
+    check(supervisor)
+    assert supervisor.workers[0][1].is_set()
+
+
+def test_page_requeued_too_often_is_failed(supervisor):
+    task = dict(TASK, requeues=2)
+    supervisor.record(0, task, "started")
+    process(supervisor).exit(9)
+    assert check(supervisor) == [task]
+    assert supervisor.task_queue.empty()
+    assert supervisor.checkpoints.get("25a", task)["status"] == "failed"
+
+
+def test_worker_stopped_by_the_controller_is_not_replaced(supervisor):
+    supervisor.workers[0][1].set()
+    process(supervisor).exit(0)
+    check(supervisor)
+    assert list(supervisor.workers) == [0] and 0 in supervisor.retired
+
+
+def test_stop_kills_only_workers_that_do_not_exit(supervisor):
+    supervisor.start_worker()
+    process(supervisor, 1).exit(0)
+    supervisor.stop(supervisor.metrics, timeout=0.2)
+    assert supervisor.workers[0][1].is_set() and supervisor.workers[1][1].is_set()
+    assert process(supervisor).killed and not process(supervisor, 1).killed
+
+
+def test_worker_blocked_on_a_full_write_queue_sends_heartbeats(monkeypatch):
+    monkeypatch.setattr(script, "HEARTBEAT_INTERVAL", 0.01)
+    write_queue, heartbeats = queue.Queue(maxsize=1), []
+    write_queue.put("page behind")
+
+    # Helper function to count the heartbeats, letting the writers catch up after the third
+    def heartbeat():
+        heartbeats.append(None)
+        if len(heartbeats) == 3:
+            write_queue.get()
+
+    output = script.QueuedOutput(script.open_output({"checkpoint_path": ":memory:", "release": "25a",
+                                                     "output_format": "excel", "store_path": None,
+                                                     "search_path": None}), write_queue, heartbeat)
+    output.write(dict(TASK), {}, "digest", {})
+    output.close()
+    assert len(heartbeats) == 3
+    assert write_queue.get_nowait()[0]["name"] == "PAY_RUN_RESULTS"
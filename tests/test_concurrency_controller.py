@@ -0,0 +1,42 @@
+import script
+
+
+# Helper function to build the timer events of a page that took the given seconds
+def page_events(seconds):
+    return [("stage", "browser-0", "page", None, seconds)]
+
+
+# Helper function to run one controller interval over pages of the given latency and status
+def run_window(controller, metrics, seconds, status="written", pages=5, active=None):
+    for _ in range(pages):
+        controller.record_page(page_events(seconds), status)
+    controller.window_started -= controller.interval
+    return controller.decide(active or controller.target, metrics)
+
+
+def make_controller(monkeypatch):
+    monkeypatch.setattr(script, "available_memory_mb", lambda: None)
+    monkeypatch.setattr(script, "cpu_load", lambda: None)
+    return script.ConcurrencyController(minimum=1, maximum=10, initial=5), script.RunMetrics()
+
+
+def test_unchanged_pages_are_not_measured(monkeypatch):
+    controller, metrics = make_controller(monkeypatch)
+    for _ in range(10):
+        controller.record_page(page_events(0.05), "unchanged")
+    assert controller.window == []
+    assert not controller.due()
+
+
+def test_one_fast_window_does_not_keep_scaling_down(monkeypatch):
+    controller, metrics = make_controller(monkeypatch)
+    run_window(controller, metrics, 1.0)  # Sets the baseline and scales up
+    targets = [run_window(controller, metrics, 3.0) for _ in range(4)]
+    assert targets[0] < 6  # A jump in latency scales down once
+    assert targets[-1] > targets[1]  # Then the slower pages become the baseline and the workers grow again
+    assert min(targets) > controller.minimum
+
+
+def test_error_rate_scales_down(monkeypatch):
+    controller, metrics = make_controller(monkeypatch)
+    assert run_window(controller, metrics, 1.0, status="failed") < 5
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+import script
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures")
+TASK = {"section": "11-Global-Payroll", "kind": "tables", "name": "PAY_RUN_RESULTS",
+        "url": "http://127.0.0.1/payrunresults-1014.html", "save_dir": None}
+
+
+# Class to stand in for a browser that has every page loaded at once
+class FakeDriver:
+    def __init__(self):
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def find_element(self, by, value):
+        return object()
+
+
+# Helper function to extract the recorded page like the browser engine would
+def extract_function(driver, section_name, page_name):
+    with open(os.path.join(FIXTURES, "payrunresults-1014.html"), "rb") as file:
+        return script.parse_table_page(file.read())
+
+
+@pytest.fixture
+def output(tmp_path):
+    output = script.SqliteOutput(script.CheckpointStore(":memory:"), "25a", str(tmp_path / "hcm.sqlite"))
+    yield output
+    output.close()
+
+
+@pytest.fixture
+def revalidations(monkeypatch):
+    revalidations = []
+
+    # Helper function to record each revalidation instead of sending a HEAD request
+    def check_page_unchanged(task, checkpoint=None):
+        revalidations.append(checkpoint)
+        return True, {"etag": checkpoint["etag"], "last_modified": None}
+
+    monkeypatch.setattr(script, "check_page_unchanged", check_page_unchanged)
+    return revalidations
+
+
+def test_page_without_checkpoint_is_not_revalidated(output, revalidations):
+    driver = FakeDriver()
+    assert script.extract_page(driver, dict(TASK), extract_function, output) == "written"
+    assert revalidations == []
+    assert driver.visited == [TASK["url"]]
+
+
+def test_page_with_current_checkpoint_is_revalidated(output, revalidations):
+    output.write(dict(TASK), extract_function(None, None, None), "digest", {"etag": '"v1"'})
+    output.flush()
+    driver = FakeDriver()
+    assert script.extract_page(driver, dict(TASK), extract_function, output) == "unchanged"
+    assert [checkpoint["etag"] for checkpoint in revalidations] == ['"v1"']
+    assert driver.visited == []
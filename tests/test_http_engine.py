@@ -0,0 +1,75 @@
+import pytest
+
+import script
+
+
+# Helper function to fetch a recorded page and parse it like the http engine does
+def fetch_and_parse(fixture_url, page, kind):
+    response = script.get_http_session().get(f"{fixture_url}{page}.html", timeout=30)
+    response.raise_for_status()
+    return script.PAGE_PARSERS[kind](response.content)
+
+
+def test_table_page(fixture_url):
+    data = fetch_and_parse(fixture_url, "payrunresults-1014", "tables")
+    assert data["header"] == "PAY_RUN_RESULTS"
+    assert data["paragraph"] == "PAY_RUN_RESULTS stores the run results of each person."
+    assert data["details"][:2] == ["Schema: FUSION", "Object owner: PAY"]
+    assert data["primary_key"] == [["PAY_RUN_RESULTS_PK", "ID"]]
+    assert len(data["columns"]) == 26
+    assert data["columns"][0] == ["ID", "TIMESTAMP", "", "", "Yes", "Id of the pay_run_results record.", "", "Active"]
+    assert len(data["columns_headers"]) == 8 and data["columns_headers"][:2] == ["Name", "Datatype"]
+    assert data["indexes"][0] == ["PAY_RUN_RESULTS_U1", "Unique", "FUSION_TS_TX_IDX", "ID", "Active"]
+    assert data["foreign_keys"] == [["PAY_RUN_RESULTS", "PER_ALL_PEOPLE_F", "PERSON_ID"]]
+    assert data["foreign_keys_headers"][:2] == ["Table", "Foreign Table"]
+
+
+def test_table_with_1200_columns(fixture_url):
+    data = fetch_and_parse(fixture_url, "payrunresultvalues-1021", "tables")
+    assert data["header"] == "PAY_RUN_RESULT_VALUES"
+    assert len(data["columns"]) == 1200
+    assert all(len(row) == len(data["columns_headers"]) for row in data["columns"])
+    assert data["columns"][1][0] == "OBJECT_VERSION_NUMBER"
+    assert len(data["indexes"]) == 2
+
+
+@pytest.mark.parametrize("page, present, missing", [
+    ("ircjobfamilies-1028", ["details", "primary_key", "columns"], ["indexes", "foreign_keys"]),
+    ("paybalattributedefinitions-1063", ["columns"], ["details", "primary_key", "indexes", "foreign_keys"]),
+])
+def test_table_missing_sections(fixture_url, page, present, missing):
+    data = fetch_and_parse(fixture_url, page, "tables")
+    for key in present:
+        assert data[key], key
+    for key in missing:
+        assert data[key] == [], key
+    assert data["indexes_headers"] == [] and data["foreign_keys_headers"] == []
+
+
+def test_view_page(fixture_url):
+    data = fetch_and_parse(fixture_url, "payrunresultsv-2007", "views")
+    assert data["header"] == "PAY_RUN_RESULTS_V"
+    assert data["details"][0] == "Schema: FUSION"
+    assert data["columns"] == [["ID"], ["PERSON_ID"], ["LAST_UPDATE_DATE"]]
+    assert data["columns_headers"] == ["Name"]
+    assert data["query_headers"] == ["SQL_Statement"]
+    assert data["query"][0][0].startswith("SELECT\n  t.ID,")
+
+
+def test_view_missing_details_and_query(fixture_url):
+    data = fetch_and_parse(fixture_url, "ircsubmissionsv-2000", "views")
+    assert data["header"] == "IRC_SUBMISSIONS_V"
+    assert data["details"] == []
+    assert data["columns"] == [["ID"], ["PERSON_ID"], ["LAST_UPDATE_DATE"]]
+    assert data["query"] == [] and data["query_headers"] == []
+
+
+def test_page_without_header_is_rejected(fixture_url):
+    with pytest.raises(ValueError):
+        fetch_and_parse(fixture_url, "index", "tables")
+
+
+def test_iter_pages_prints_nothing(fixture_url, capsys):
+    pages = list(script.iter_pages("25a", base_url=fixture_url, workers=4))
+    assert len(pages) == 25
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,35 @@
+import json
+import os
+
+import pytest
+
+import script
+
+
+def test_manifest_from_table_of_contents(fixture_url, tmp_path):
+    manifest = script.load_manifest(str(tmp_path), "25a", fixture_url)
+    assert [section["name"] for section in manifest["sections"]] == \
+        ["3-Absence-Management", "11-Global-Payroll", "22-Recruiting"]
+    assert sum(len(section["tables"]) + len(section["views"]) for section in manifest["sections"]) == 25
+    assert os.path.exists(script.manifest_path(str(tmp_path), "25a"))
+
+
+def test_table_of_contents_without_pages_is_refused(tmp_path):
+    content = b"<html><body><ul><li><a href='a.html'>Overview</a></li></ul></body></html>"
+    with pytest.raises(ValueError, match="No sections"):
+        script.build_manifest(content, {"etag": None, "last_modified": None}, "25a", "http://127.0.0.1/")
+
+
+def test_empty_manifest_is_neither_saved_nor_reused(fixture_url, tmp_path, monkeypatch):
+    path = script.manifest_path(str(tmp_path), "25a")
+    monkeypatch.setattr(script, "parse_toc", lambda content, base_url: [])
+    with pytest.raises(ValueError):
+        script.load_manifest(str(tmp_path), "25a", fixture_url)
+    assert not os.path.exists(path)
+
+    # An empty manifest cached by an earlier version is rebuilt instead of trusted
+    monkeypatch.undo()
+    manifest = script.load_manifest(str(tmp_path), "25a", fixture_url)
+    with open(path, "w") as file:
+        json.dump(dict(manifest, sections=[]), file)
+    assert script.load_manifest(str(tmp_path), "25a", fixture_url, check_toc=False)["sections"]
@@ -0,0 +1,236 @@
+import threading
+import time
+from collections import defaultdict
+
+import pytest
+
+import script
+
+
+# Class to stand in for a Redis server in one process, keeping the hashes and sorted sets RedisWorkQueue uses in
+# memory; a transaction holds the lock from its first read to its execute, so watched keys cannot change under it
+class LocalRedis:
+    def __init__(self, clock=time):
+        self.clock = clock
+        self.lock = threading.RLock()
+        self.hashes = defaultdict(dict)
+        self.sorted_sets = defaultdict(dict)
+
+    def pipeline(self):
+        return LocalRedisPipeline(self)
+
+    def transaction(self, func, *watches, value_from_callable=False):
+        with self.lock:
+            pipeline = LocalRedisPipeline(self, buffered=False)
+            value = func(pipeline)
+            results = pipeline.execute()
+        return value if value_from_callable else results
+
+    def time(self):
+        now = self.clock.time()
+        return int(now), int(now % 1 * 1e6)
+
+    def hsetnx(self, key, field, value):
+        with self.lock:
+            if field in self.hashes[key]:
+                return False
+            self.hashes[key][field] = str(value)
+            return True
+
+    def hget(self, key, field):
+        with self.lock:
+            return self.hashes[key].get(field)
+
+    def hmget(self, key, fields):
+        with self.lock:
+            return [self.hashes[key].get(field) for field in fields]
+
+    def hset(self, key, field, value):
+        with self.lock:
+            added = field not in self.hashes[key]
+            self.hashes[key][field] = str(value)
+            return int(added)
+
+    def hdel(self, key, *fields):
+        with self.lock:
+            return sum(self.hashes[key].pop(field, None) is not None for field in fields)
+
+    def hincrby(self, key, field, amount=1):
+        with self.lock:
+            value = int(self.hashes[key].get(field) or 0) + amount
+            self.hashes[key][field] = str(value)
+            return value
+
+    def hlen(self, key):
+        with self.lock:
+            return len(self.hashes[key])
+
+    def hkeys(self, key):
+        with self.lock:
+            return list(self.hashes[key])
+
+    def hgetall(self, key):
+        with self.lock:
+            return dict(self.hashes[key])
+
+    def zadd(self, key, mapping, nx=False, xx=False):
+        with self.lock:
+            members = self.sorted_sets[key]
+            added = 0
+            for member, score in mapping.items():
+                if (nx and member in members) or (xx and member not in members):
+                    continue
+                added += member not in members
+                members[member] = float(score)
+            return added
+
+    def zrem(self, key, *members):
+        with self.lock:
+            return sum(self.sorted_sets[key].pop(member, None) is not None for member in members)
+
+    def zrangebyscore(self, key, minimum, maximum, start=None, num=None):
+        with self.lock:
+            members = sorted((score, member) for member, score in self.sorted_sets[key].items()
+                             if float(minimum) <= score <= float(maximum))
+        members = [member for _, member in members]
+        return members[start or 0:(start or 0) + num] if num is not None else members
+
+    def zcard(self, key):
+        with self.lock:
+            return len(self.sorted_sets[key])
+
+    def close(self):
+        pass
+
+# Class to queue the commands of a LocalRedis pipeline until execute; a transaction's pipeline runs them at once
+# until multi is called, like a pipeline watching keys
+class LocalRedisPipeline:
+    def __init__(self, client, buffered=True):
+        self.client = client
+        self.buffered = buffered
+        self.commands = []
+
+    def multi(self):
+        self.buffered = True
+
+    def execute(self):
+        with self.client.lock:
+            results = [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+    def __getattr__(self, name):
+        command = getattr(self.client, name)
+        if not self.buffered:
+            return command
+
+        # Helper function to queue a command instead of running it
+        def queue_command(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue_command
+
+
+TASKS = [{"release": "25a", "base_url": "http://127.0.0.1/", "section": "11-Global-Payroll", "kind": "tables",
+          "name": name, "url": f"http://127.0.0.1/{name.lower()}.html"} for name in ("A", "B", "C")]
+VISIBILITY = 60
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def work_queue(request, clock, tmp_path):
+    if request.param == "sqlite":
+        work_queue = script.SqliteWorkQueue(str(tmp_path / "queue.sqlite"), "test", VISIBILITY, max_attempts=2)
+    else:
+        work_queue = script.RedisWorkQueue(LocalRedis(clock), "test", VISIBILITY, max_attempts=2)
+    yield work_queue
+    work_queue.close()
+
+
+# Helper function to get the ids of leased pages
+def ids(leases):
+    return {task_id for task_id, _, _ in leases}
+
+
+def test_publish_is_idempotent(work_queue):
+    assert work_queue.publish(TASKS) == 3
+    assert work_queue.publish(TASKS) == 0
+    assert work_queue.counts() == {"queued": 3, "leased": 0, "done": 0, "failed": 0, "total": 3}
+
+
+def test_lease_hides_pages_from_other_nodes(work_queue):
+    work_queue.publish(TASKS)
+    first, second = work_queue.lease("node-a", 2), work_queue.lease("node-b", 5)
+    assert len(first) == 2 and len(second) == 1
+    assert not ids(first) & ids(second)
+    assert work_queue.lease("node-c", 5) == []
+    assert first[0][2] == next(task for task in TASKS if script.queue_task_id(task) == first[0][0])
+
+
+def test_only_the_first_completion_counts(work_queue):
+    work_queue.publish(TASKS)
+    task_id = work_queue.lease("node-a", 1)[0][0]
+    assert work_queue.complete(task_id, "node-a", "hash-a")
+    assert not work_queue.complete(task_id, "node-b", "hash-b")
+    assert work_queue.completions() == {task_id: ("node-a", "hash-a")}
+    assert work_queue.counts()["done"] == 1
+
+
+def test_failure_with_a_stale_token_is_ignored(work_queue):
+    work_queue.publish(TASKS[:1])
+    task_id, _, _ = work_queue.lease("node-a", 1)[0]
+    work_queue.fail(task_id, "stale-token", "stale lease")
+    assert work_queue.counts()["leased"] == 1
+    assert work_queue.failures() == []
+
+
+def test_extended_lease_outlives_an_expired_one(work_queue, clock):
+    work_queue.publish(TASKS[:2])
+    held, expiring = work_queue.lease("node-a", 1)[0], work_queue.lease("node-b", 1)[0]
+    clock.advance(VISIBILITY * 0.6)
+    work_queue.extend([held])
+    clock.advance(VISIBILITY * 0.6)
+    assert ids(work_queue.lease("node-c", 5)) == {expiring[0]}
+
+
+def test_page_failing_every_attempt_is_failed(work_queue):
+    work_queue.publish(TASKS[:1])
+    task_id, token, _ = work_queue.lease("node-a", 1)[0]
+    work_queue.fail(task_id, token, "extraction failed")
+    assert work_queue.counts()["queued"] == 1  # Queued again while attempts are left
+    task_id, token, _ = work_queue.lease("node-b", 1)[0]
+    work_queue.fail(task_id, token, "extraction failed")
+    assert work_queue.lease("node-c", 1) == []
+    assert work_queue.failures() == [(task_id, "extraction failed")]
+
+
+def test_page_whose_leases_keep_expiring_is_failed(work_queue, clock):
+    work_queue.publish(TASKS[:1])
+    for _ in range(2):
+        assert len(work_queue.lease("node-a", 1)) == 1
+        clock.advance(VISIBILITY + 1)
+    assert work_queue.lease("node-b", 1) == []
+    assert [task_id for task_id, _ in work_queue.failures()] == [script.queue_task_id(TASKS[0])]
+
+
+def test_retry_failed_queues_failed_pages_again(work_queue):
+    work_queue.publish(TASKS[:1])
+    for _ in range(2):
+        task_id, token, _ = work_queue.lease("node-a", 1)[0]
+        work_queue.fail(task_id, token, "extraction failed")
+    assert work_queue.counts()["failed"] == 1
+    assert work_queue.publish(TASKS[:1], retry_failed=True) == 0
+    assert work_queue.failures() == []
+    assert ids(work_queue.lease("node-b", 1)) == {task_id}
+
+
+def test_queue_worker_drains_a_release(fixture_url, tmp_path):
+    work_queue = script.SqliteWorkQueue(str(tmp_path / "queue.sqlite"))
+    try:
+        assert script.publish_release(work_queue, "25a", fixture_url, cache_dir=str(tmp_path)) == 25
+        script.run_queue_worker(work_queue, str(tmp_path / "node"), engine="http", workers=2, output_format="sqlite",
+                                batch_size=7, name="node-a", search_index=False)
+        assert work_queue.counts() == {"queued": 0, "leased": 0, "done": 25, "failed": 0, "total": 25}
+        assert {worker for worker, _ in work_queue.completions().values()} == {"node-a"}
+    finally:
+        work_queue.close()
@@ -0,0 +1,59 @@
+import json
+import sqlite3
+
+import script
+
+
+# Helper function to count the checkpoints of a run by status
+def checkpoint_statuses(path):
+    connection = sqlite3.connect(path)
+    try:
+        return dict(connection.execute("SELECT status, COUNT(*) FROM pages GROUP BY status").fetchall())
+    finally:
+        connection.close()
+
+
+def test_pages_are_written_once_the_writers_saved_them(fixture_url, tmp_path):
+    script.extract_data_with_pool(engine="http", output=str(tmp_path), base_url=fixture_url, output_format="sqlite",
+                                  workers=4, search_index=False)
+    with open(tmp_path / "run-report.json") as f:
+        report = json.load(f)
+    assert report["pages"] == {"written": 25}
+    assert report["startup"]["time_to_first_page_seconds"] is not None
+    assert checkpoint_statuses(tmp_path / "checkpoints.sqlite") == {"done": 25}
+
+
+def test_pages_the_writers_could_not_save_are_failed(fixture_url, tmp_path, monkeypatch):
+    write_batch = script.SqliteOutput.write_batch
+
+    # Helper function to fail every batch holding a page of one section
+    def failing_write_batch(self, pages, timer=None):
+        if any(task["section"] == "22-Recruiting" for task, _, _, _ in pages):
+            raise OSError("disk full")
+        return write_batch(self, pages, timer)
+
+    monkeypatch.setattr(script.SqliteOutput, "batch_size", 1)
+    monkeypatch.setattr(script.SqliteOutput, "write_batch", failing_write_batch)
+    script.extract_data_with_pool(engine="http", output=str(tmp_path), base_url=fixture_url, output_format="sqlite",
+                                  workers=4, search_index=False)
+    with open(tmp_path / "run-report.json") as f:
+        report = json.load(f)
+    checkpoints = checkpoint_statuses(tmp_path / "checkpoints.sqlite")
+    assert checkpoints["failed"] > 0
+    assert report["pages"] == {"written": checkpoints["done"], "failed": checkpoints["failed"]}
+    assert "pages_not_saved" not in report["events"]
+
+
+def test_pages_never_confirmed_are_failed():
+    metrics = script.RunMetrics()
+    saved, lost = ({"section": "s", "kind": "tables", "name": name} for name in ("a", "b"))
+    early = {"section": "s", "kind": "tables", "name": "c"}
+    metrics.page_saved(early, False)  # A writer may confirm a page before its worker reports it
+    metrics.page_handed(saved)
+    metrics.page_handed(lost)
+    metrics.page_handed(early)
+    assert metrics.statuses == {"failed": 1}
+    metrics.page_saved(saved, True)
+    metrics.settle_writes()
+    assert metrics.statuses == {"written": 1, "failed": 2}
+    assert metrics.counters["pages_not_saved"] == 1